@@ -0,0 +1,99 @@
+"""Headless batch scoring of a folder of class workbooks.
+
+    python api_batch.py class_files/ -o school_summary.csv -j 8
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from api_scoring import (
+    DIVISION_ORDER, FIVE_SUBJECT_COLS, division_codes, prepare_five_subject,
+    prepare_single_subject, score_percentages,
+)
+from ingestion import read_workbook
+
+SUMMARY_COLUMNS = ['Class', 'Mode', 'API Score', 'Total Students'] + DIVISION_ORDER + ['Error']
+
+# -------------------- SCORING --------------------
+def prepare_class_frame(df):
+    """Pick five-subject or single-subject mode from a normalized sheet's columns; returns (mode, prepared frame)"""
+    if all(col in df.columns for col in FIVE_SUBJECT_COLS):
+        return 'Five Subject', prepare_five_subject(df)
+    return 'Single Subject', prepare_single_subject(df)
+
+
+def score_class_frame(df):
+    """Score a normalized class sheet, picking five-subject or single-subject mode from its columns"""
+    return summarize_class(*prepare_class_frame(df))
+
+
+def summarize_class(mode, df):
+    """Summary row (mode, API score, student and division counts) of a prepared class frame"""
+    result = score_percentages(df['percentage'])
+    division_counts = pd.Series(division_codes(df['percentage'])).value_counts()
+    row = {
+        'Mode': mode,
+        'API Score': result.api_score,
+        'Total Students': result.total_students,
+    }
+    row.update({label: int(division_counts.get(i, 0)) for i, label in enumerate(DIVISION_ORDER)})
+    return row
+
+
+def score_class_file(path):
+    """Summary row for one workbook; problems are reported in the Error column"""
+    row = {'Class': Path(path).stem}
+    try:
+        row.update(score_class_frame(read_workbook(path, normalize=True)))
+    except Exception as e:
+        row['Error'] = str(e)
+    return row
+
+
+def find_class_files(folder):
+    return sorted(p for p in Path(folder).iterdir() if p.suffix.lower() == '.xlsx' and not p.name.startswith('~$'))
+
+
+def score_folder(folder, workers=None):
+    """Score every workbook in ``folder`` across a process pool"""
+    paths = [str(p) for p in find_class_files(folder)]
+    if not paths:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        rows = [score_class_file(p) for p in paths]
+    else:
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(score_class_file, paths, chunksize=chunksize))
+    summary = pd.DataFrame(rows).reindex(columns=SUMMARY_COLUMNS)
+    count_cols = ['Total Students'] + DIVISION_ORDER
+    summary[count_cols] = summary[count_cols].astype('Int64')
+    return summary
+
+
+# -------------------- CLI --------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Score a folder of class workbooks and write one summary.')
+    parser.add_argument('folder', help='folder containing class .xlsx files')
+    parser.add_argument('-o', '--output', default='api_summary.csv', help='summary file (.csv or .xlsx)')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='worker processes (default: all cores)')
+    args = parser.parse_args(argv)
+
+    summary = score_folder(args.folder, args.workers)
+    if args.output.lower().endswith('.xlsx'):
+        summary.to_excel(args.output, index=False)
+    else:
+        summary.to_csv(args.output, index=False)
+
+    failed = summary['Error'].notna().sum()
+    print(f'Scored {len(summary) - failed} of {len(summary)} class files -> {args.output}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
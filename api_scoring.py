@@ -0,0 +1,287 @@
+import hashlib
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# -------------------- API BANDS --------------------
+# (label, low, high, weight) in display order. Bounds are inclusive on both
+# sides, so values falling between two bands (e.g. 94.995) carry no weight.
+API_BANDS = [
+    ('>95', 95, 100, 10),
+    ('90-94.99', 90, 94.99, 8),
+    ('80-89.99', 80, 89.99, 6),
+    ('70-79.99', 70, 79.99, 4),
+    ('60-69.99', 60, 69.99, 2),
+    ('50-59.99', 50, 59.99, 0),
+    ('33-49.99', 33, 49.99, -1),
+    ('<33', 0, 32.99, -3),
+]
+
+BAND_LABELS = [label for label, _, _, _ in API_BANDS]
+BAND_WEIGHTS = np.array([weight for _, _, _, weight in API_BANDS], dtype=np.int64)
+
+# Lookup tables sorted by lower edge for searchsorted
+_ORDER = np.argsort([low for _, low, _, _ in API_BANDS], kind='stable')
+_LOWS = np.array([API_BANDS[i][1] for i in _ORDER], dtype=float)
+_HIGHS = np.array([API_BANDS[i][2] for i in _ORDER], dtype=float)
+
+ApiResult = namedtuple('ApiResult', ['api_score', 'band_counts', 'band_index', 'total_students'])
+
+
+# -------------------- SCORING ENGINE --------------------
+def to_percentage(totals, total_max):
+    """Percentage of ``total_max``; marks already out of 100 pass through unchanged"""
+    if total_max == 100:
+        return totals
+    return (totals / total_max) * 100
+
+
+def assign_bands(percentages):
+    """Return the API band index of every percentage, -1 where no band applies"""
+    pct = np.asarray(percentages, dtype=float)
+    pos = np.searchsorted(_LOWS, pct, side='right') - 1
+    candidate = _ORDER[np.clip(pos, 0, None)]
+    inside = (pos >= 0) & (pct <= _HIGHS[np.clip(pos, 0, None)])
+    return np.where(inside, candidate, -1)
+
+
+def score_percentages(percentages):
+    """Score percentages in one pass: API score, per-band counts and band per row"""
+    band_index = assign_bands(percentages)
+    total_students = len(band_index)
+    band_counts = np.bincount(band_index[band_index >= 0], minlength=len(API_BANDS))
+    total_weighted_score = int(band_counts @ BAND_WEIGHTS)
+    api_score = (total_weighted_score / total_students) * 100 if total_students else None
+    return ApiResult(api_score, dict(zip(BAND_LABELS, band_counts.tolist())), band_index, total_students)
+
+
+def band_labels(band_index):
+    """Map band indices to labels, None where no band applies"""
+    labels = np.array(BAND_LABELS + [None], dtype=object)
+    return labels[band_index]
+
+
+def calculate_api_from_percentage(percentages):
+    band_index = assign_bands(percentages)
+    band_counts = np.bincount(band_index[band_index >= 0], minlength=len(API_BANDS))
+    return (int(band_counts @ BAND_WEIGHTS) / len(band_index)) * 100
+
+
+# -------------------- CLASS SHEETS --------------------
+FIVE_SUBJECT_COLS = ['subject1', 'subject2', 'subject3', 'subject4', 'subject5']
+
+
+def prepare_single_subject(df):
+    """Validate a normalized Name/Marks sheet and add its percentage column"""
+    if not {'name', 'marks'}.issubset(df.columns):
+        raise ValueError('Excel must contain columns: Name, Marks')
+
+    if df['marks'].max() > 100 or df['marks'].min() < 0:
+        raise ValueError('Marks must be between 0 and 100')
+
+    df['percentage'] = df['marks']
+    return df
+
+
+def subject_totals(df, subject_cols, max_marks=100):
+    """Validate a block of subject marks and return (totals, percentages) in one pass over the matrix.
+
+    ``max_marks`` is one maximum for every subject or a {subject: maximum}
+    mapping (missing subjects default to 100). Blank marks count as zero in
+    the total, like DataFrame.sum.
+    """
+    if isinstance(max_marks, dict):
+        maxes = np.array([max_marks.get(col, 100) for col in subject_cols], dtype=float)
+    else:
+        maxes = np.full(len(subject_cols), max_marks, dtype=float)
+
+    marks = df[subject_cols].to_numpy(dtype=float)
+    out_of_range = (marks < 0) | (marks > maxes)
+    if out_of_range.any():
+        if np.all(maxes == maxes[0]):
+            raise ValueError(f'Marks must be between 0 and {maxes[0]:g}')
+        col = subject_cols[int(np.argmax(out_of_range.any(axis=0)))]
+        raise ValueError(f'Marks in {col} must be between 0 and {maxes[subject_cols.index(col)]:g}')
+
+    totals = np.nansum(marks, axis=1)
+    if all(pd.api.types.is_integer_dtype(df[col]) for col in subject_cols):
+        totals = totals.astype(np.int64)
+    return totals, to_percentage(totals, maxes.sum())
+
+
+# Numeric columns that identify a student rather than hold marks (roll no, id, ...)
+ID_COLUMN = re.compile(
+    r'(?<![a-z])(id|roll|rollno|sr|sno|serial|no|number|reg|regno|registration|admission|adm'
+    r'|enrollment|enrolment|index|code|phone|mobile|year|class|section)(?![a-z])'
+)
+
+
+def detect_subject_columns(df, exclude=('name',)):
+    """Numeric columns of a normalized sheet, in sheet order, other than ``exclude`` and ID-like ones"""
+    return [
+        col for col in df.columns
+        if col not in exclude and not ID_COLUMN.search(str(col)) and pd.api.types.is_numeric_dtype(df[col])
+    ]
+
+
+def prepare_subjects(df, subject_cols=None, max_marks=100):
+    """Validate a normalized Name + any-subjects sheet and add total and percentage"""
+    if subject_cols is None:
+        subject_cols = detect_subject_columns(df)
+    else:
+        subject_cols = list(subject_cols)
+        if not subject_cols:
+            raise ValueError('Select at least one subject column')
+    if 'name' not in df.columns or not subject_cols:
+        raise ValueError('Excel must contain Name and at least one subject column')
+
+    df['total'], df['percentage'] = subject_totals(df, subject_cols, max_marks)
+    return df
+
+
+def prepare_five_subject(df):
+    """Validate a normalized Name/Subject1..Subject5 sheet and add total and percentage"""
+    if not all(col in df.columns for col in ['name'] + FIVE_SUBJECT_COLS):
+        raise ValueError('Excel must contain Name and Subject1 to Subject5')
+
+    return prepare_subjects(df, FIVE_SUBJECT_COLS)
+
+
+# -------------------- DIVISION & PERFORMANCE TABLE --------------------
+# (lower bound, label) rules, highest first; the last rule catches the rest.
+DIVISION_RULES = [
+    (95, '>95'), (90, '90-94.99'), (80, '80-89.99'), (70, '70-79.99'),
+    (60, '60-69.99'), (50, '50-59.99'), (33, '33-49.99'), (None, '<33'),
+]
+PERFORMANCE_RULES = [
+    (95, 'High Achiever'), (75, 'Average'), (50, 'Needs Improvement'),
+    (33, 'Remedial'), (None, 'Critical'),
+]
+FEEDBACK_RULES = [
+    (90, 'Excellent performance'), (75, 'Good performance, keep improving'),
+    (60, 'Needs some improvement'), (33, 'Needs significant improvement'),
+    (None, 'At risk, requires immediate attention'),
+]
+
+DIVISION_ORDER = [label for _, label in DIVISION_RULES]
+PERFORMANCE_ORDER = [label for _, label in PERFORMANCE_RULES]
+FEEDBACK_ORDER = [label for _, label in FEEDBACK_RULES]
+
+Classification = namedtuple('Classification', ['division', 'api_weight', 'performance', 'feedback'])
+
+# Fingerprint of every band and rule table; stored results computed under a
+# different scheme are never reused.
+BAND_SCHEME_VERSION = hashlib.sha256(
+    repr((API_BANDS, DIVISION_RULES, PERFORMANCE_RULES, FEEDBACK_RULES)).encode()
+).hexdigest()[:12]
+
+
+def _rule_index(rules, pct):
+    for i, (low, _) in enumerate(rules):
+        if low is None or pct >= low:
+            return i
+
+
+def division_bucket(pct):
+    return DIVISION_ORDER[_rule_index(DIVISION_RULES, pct)]
+
+
+def performance_tag(pct):
+    return PERFORMANCE_ORDER[_rule_index(PERFORMANCE_RULES, pct)]
+
+
+# Every rule edge splits the percentage axis into segments; each segment maps
+# to exactly one division, performance category and feedback message.
+_SEGMENT_EDGES = np.array(sorted({
+    low for rules in (DIVISION_RULES, PERFORMANCE_RULES, FEEDBACK_RULES)
+    for low, _ in rules if low is not None
+}), dtype=float)
+_SEGMENT_STARTS = [-np.inf] + _SEGMENT_EDGES.tolist()
+_SEGMENT_DIVISION = np.array([_rule_index(DIVISION_RULES, s) for s in _SEGMENT_STARTS], dtype=np.int8)
+_SEGMENT_PERFORMANCE = np.array([_rule_index(PERFORMANCE_RULES, s) for s in _SEGMENT_STARTS], dtype=np.int8)
+_SEGMENT_FEEDBACK = np.array([_rule_index(FEEDBACK_RULES, s) for s in _SEGMENT_STARTS], dtype=np.int8)
+
+
+def _segments(pct):
+    # NaN fails every ">=" rule, so it lands in the lowest segment like the scalar rules
+    return np.where(np.isnan(pct), 0, np.searchsorted(_SEGMENT_EDGES, pct, side='right'))
+
+
+def division_codes(percentages):
+    """Index into DIVISION_ORDER for every percentage"""
+    return _SEGMENT_DIVISION[_segments(np.asarray(percentages, dtype=float))]
+
+
+def classify_percentages(percentages):
+    """Division, API weight, performance category and feedback for every row in one lookup"""
+    pct = np.asarray(percentages, dtype=float)
+    segment = _segments(pct)
+    band_index = assign_bands(pct)
+    api_weight = np.where(band_index >= 0, BAND_WEIGHTS[band_index], 0).astype(np.int8)
+    return Classification(
+        pd.Categorical.from_codes(_SEGMENT_DIVISION[segment], categories=DIVISION_ORDER),
+        api_weight,
+        pd.Categorical.from_codes(_SEGMENT_PERFORMANCE[segment], categories=PERFORMANCE_ORDER),
+        pd.Categorical.from_codes(_SEGMENT_FEEDBACK[segment], categories=FEEDBACK_ORDER),
+    )
+
+
+# -------------------- RUNNING TALLY --------------------
+class ScoreTally:
+    """Running band and division counts that can be fed chunk by chunk and merged"""
+
+    def __init__(self):
+        self.total_students = 0
+        self.marked = 0
+        self.band_counts = np.zeros(len(API_BANDS), dtype=np.int64)
+        self.division_counts = np.zeros(len(DIVISION_ORDER), dtype=np.int64)
+        self.percentage_sum = 0.0
+
+    def update(self, percentages):
+        pct = np.asarray(percentages, dtype=float)
+        band_index = assign_bands(pct)
+        self.total_students += len(pct)
+        self.marked += int(np.count_nonzero(~np.isnan(pct)))
+        self.band_counts += np.bincount(band_index[band_index >= 0], minlength=len(API_BANDS))
+        self.division_counts += np.bincount(division_codes(pct), minlength=len(DIVISION_ORDER))
+        self.percentage_sum += float(np.nansum(pct))
+        return self
+
+    def merge(self, other):
+        self.total_students += other.total_students
+        self.marked += other.marked
+        self.band_counts += other.band_counts
+        self.division_counts += other.division_counts
+        self.percentage_sum += other.percentage_sum
+        return self
+
+    @property
+    def api_score(self):
+        if not self.total_students:
+            return None
+        return (int(self.band_counts @ BAND_WEIGHTS) / self.total_students) * 100
+
+    def division_distribution(self):
+        return dict(zip(DIVISION_ORDER, self.division_counts.tolist()))
+
+    def to_dict(self):
+        """Plain-JSON form, for storing partial tallies"""
+        return {
+            'total_students': self.total_students,
+            'marked': self.marked,
+            'band_counts': self.band_counts.tolist(),
+            'division_counts': self.division_counts.tolist(),
+            'percentage_sum': self.percentage_sum,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        tally = cls()
+        tally.total_students = data['total_students']
+        tally.marked = data['marked']
+        tally.band_counts = np.array(data['band_counts'], dtype=np.int64)
+        tally.division_counts = np.array(data['division_counts'], dtype=np.int64)
+        tally.percentage_sum = data['percentage_sum']
+        return tally
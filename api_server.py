@@ -0,0 +1,252 @@
+"""Local HTTP scoring service for pushing marks programmatically.
+
+    python api_server.py --port 8502 -j 4
+
+    GET  /health                 -> {"status": "ok"}
+    POST /score[?rows=1]         one class: JSON {"class": ..., "students": [{...}, ...]} or a CSV sheet
+    POST /batch[?rows=1]         many classes: JSON {"classes": [...]} or a CSV sheet with a Class column
+
+Student rows use the workbook columns (Name + Marks, or Name + Subject1..Subject5).
+Each class comes back with its API score, student count and division counts, plus
+per-student percentage and division when ``rows=1``.
+"""
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from api_batch import prepare_class_frame, summarize_class
+from api_scoring import DIVISION_ORDER, division_codes
+from ingestion import normalize_headers
+
+MAX_BODY = 64 * 2**20
+READ_TIMEOUT = 30
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           408: 'Request Timeout', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# -------------------- SCORING (runs in the worker pool) --------------------
+def score_class(name, df, include_rows=False):
+    """Result dict for one class frame; validation problems come back as an 'error' entry"""
+    result = {'class': name}
+    if df.empty or not all(isinstance(col, str) for col in df.columns):
+        result['error'] = 'Students must be a non-empty list of {column: value} objects'
+        return result
+    try:
+        mode, df = prepare_class_frame(_numeric_marks(normalize_headers(df)))
+    except Exception as e:
+        # One bad class is reported on its own instead of failing the batch
+        result['error'] = str(e)
+        return result
+
+    row = summarize_class(mode, df)
+    result.update({
+        'mode': row['Mode'],
+        'api_score': row['API Score'],
+        'total_students': row['Total Students'],
+        'divisions': {label: row[label] for label in DIVISION_ORDER},
+    })
+    if include_rows:
+        pct = df['percentage'].to_numpy(dtype=float)
+        divisions = np.array(DIVISION_ORDER, dtype=object)[division_codes(pct)]
+        result['students'] = [
+            {'name': name, 'percentage': None if p != p else p, 'division': division}
+            for name, p, division in zip(df['name'].astype(str).tolist(), pct.tolist(), divisions.tolist())
+        ]
+    return result
+
+
+def _numeric_marks(df):
+    # JSON clients often send marks as strings ("96"); blanks become missing marks
+    for col in df.columns:
+        if col == 'name' or pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        values = pd.to_numeric(df[col], errors='coerce')
+        bad = values.isna() & df[col].notna() & (df[col].astype(str).str.strip() != '')
+        if bad.any():
+            raise ValueError(f'Column {col!r} must be numeric, got {df[col][bad].iloc[0]!r}')
+        df[col] = values
+    return df
+
+
+def _json_classes(payload, batch):
+    if batch:
+        if not isinstance(payload, dict) or not isinstance(payload.get('classes'), list):
+            raise HttpError(400, 'JSON body must be {"classes": [{"class": ..., "students": [...]}, ...]}')
+        classes = payload['classes']
+    else:
+        classes = [payload]
+    for i, entry in enumerate(classes):
+        if not isinstance(entry, dict) or not isinstance(entry.get('students'), list):
+            raise HttpError(400, 'Every class must be {"class": ..., "students": [{...}, ...]}')
+        yield str(entry.get('class', i + 1)), pd.DataFrame(entry['students'])
+
+
+def _csv_classes(body, batch):
+    df = pd.read_csv(BytesIO(body))
+    if not batch:
+        yield '1', df
+        return
+    class_col = next((col for col in df.columns if str(col).strip().lower() == 'class'), None)
+    if class_col is None:
+        raise HttpError(400, 'Batch CSV must have a Class column')
+    for name, group in df.groupby(class_col, sort=False, dropna=False):
+        # Rows with a blank Class come back as their own entry with an error
+        yield (None if pd.isna(name) else str(name)), group.drop(columns=class_col).reset_index(drop=True)
+
+
+def score_request(body, content_type, batch, include_rows):
+    """(status, payload) for one request body; called in a worker"""
+    try:
+        if content_type.startswith('text/csv'):
+            classes = list(_csv_classes(body, batch))
+        else:
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                raise HttpError(400, 'Body must be JSON or text/csv')
+            classes = list(_json_classes(payload, batch))
+    except HttpError as e:
+        return e.status, {'error': str(e)}
+    except (ValueError, pd.errors.ParserError) as e:
+        return 400, {'error': f'Could not read CSV: {e}'}
+
+    results = [
+        score_class(name, df, include_rows) if name is not None
+        else {'class': None, 'error': f'Rows without a Class: {len(df)}'}
+        for name, df in classes
+    ]
+    if batch:
+        return 200, {'classes': results}
+    result = results[0]
+    return (400 if 'error' in result else 200), result
+
+
+# -------------------- HTTP --------------------
+async def read_request(reader):
+    """(method, path, headers, body) of one HTTP/1.1 request"""
+    request_line = await reader.readline()
+    if not request_line:
+        raise ConnectionResetError
+    try:
+        method, target, _ = request_line.decode('latin-1').split(' ', 2)
+    except ValueError:
+        raise HttpError(400, 'Malformed request line')
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        key, _, value = line.decode('latin-1').partition(':')
+        headers[key.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length') or 0)
+    except ValueError:
+        raise HttpError(400, 'Invalid Content-Length')
+    if length < 0:
+        raise HttpError(400, 'Invalid Content-Length')
+    if length > MAX_BODY:
+        raise HttpError(413, f'Body larger than {MAX_BODY} bytes')
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), target, headers, body
+
+
+def encode_response(status, payload):
+    body = json.dumps(payload, default=lambda v: None if v is pd.NA else str(v)).encode('utf-8')
+    head = (
+        f'HTTP/1.1 {status} {REASONS.get(status, "")}\r\n'
+        'Content-Type: application/json\r\n'
+        f'Content-Length: {len(body)}\r\n'
+        'Connection: close\r\n\r\n'
+    )
+    return head.encode('latin-1') + body
+
+
+class ScoringServer:
+    """asyncio front end; request bodies are parsed and scored in a worker pool"""
+
+    def __init__(self, workers=None, threads=False):
+        workers = workers or os.cpu_count() or 1
+        self.pool = ThreadPoolExecutor(workers) if threads else ProcessPoolExecutor(workers)
+
+    async def dispatch(self, method, target, headers, body):
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        include_rows = query.get('rows', ['0'])[0].lower() in ('1', 'true', 'yes')
+        if url.path == '/health':
+            return 200, {'status': 'ok'}
+        if url.path not in ('/score', '/batch'):
+            return 404, {'error': f'No route for {url.path}'}
+        if method != 'POST':
+            return 405, {'error': 'Use POST'}
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.pool, score_request, body, headers.get('content-type', ''), url.path == '/batch', include_rows,
+        )
+
+    async def handle(self, reader, writer):
+        try:
+            try:
+                request = await asyncio.wait_for(read_request(reader), READ_TIMEOUT)
+                status, payload = await self.dispatch(*request)
+            except HttpError as e:
+                status, payload = e.status, {'error': str(e)}
+            except asyncio.TimeoutError:
+                status, payload = 408, {'error': 'Timed out reading the request'}
+            except Exception as e:
+                status, payload = 500, {'error': str(e)}
+            writer.write(encode_response(status, payload))
+            await writer.drain()
+        except (ConnectionResetError, asyncio.IncompleteReadError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8502):
+        return await asyncio.start_server(self.handle, host, port, backlog=1024)
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+
+
+async def serve(host, port, workers=None, threads=False):
+    app = ScoringServer(workers, threads)
+    server = await app.start(host, port)
+    print(f'Scoring service listening on http://{host}:{port}')
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        app.close()
+
+
+# -------------------- CLI --------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve class scoring over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('-j', '--workers', type=int, default=None, help='scoring workers (default: all cores)')
+    parser.add_argument('--threads', action='store_true', help='score in threads instead of processes')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.threads))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+
+from api_scoring import API_BANDS
+
+# -------------------- BAND SCHEME REGISTRY --------------------
+# A scheme is a list of (label, low, high, weight) bands like API_BANDS; bounds
+# are inclusive and the first band containing a percentage wins.
+SCHEMES = {}
+
+
+def register_scheme(name, bands):
+    """Validate and register a scheme under ``name``; returns the stored bands"""
+    bands = [(str(label), float(low), float(high), float(weight)) for label, low, high, weight in bands]
+    if not bands:
+        raise ValueError(f'Scheme {name!r} has no bands')
+    for label, low, high, _ in bands:
+        if low > high:
+            raise ValueError(f'Scheme {name!r}: band {label!r} has low {low:g} above high {high:g}')
+    SCHEMES[name] = bands
+    return bands
+
+
+def parse_scheme(text):
+    """Bands from lines of 'low, high, weight' or 'label, low, high, weight'"""
+    bands = []
+    for n, line in enumerate(text.splitlines(), start=1):
+        parts = [p.strip() for p in line.split(',')]
+        if not line.strip():
+            continue
+        try:
+            if len(parts) == 3:
+                low, high, weight = map(float, parts)
+                bands.append((f'{low:g}-{high:g}', low, high, weight))
+            elif len(parts) == 4:
+                bands.append((parts[0], float(parts[1]), float(parts[2]), float(parts[3])))
+            else:
+                raise ValueError
+        except ValueError:
+            raise ValueError(f"Line {n}: expected 'low, high, weight' or 'label, low, high, weight'")
+    return bands
+
+
+register_scheme('Current', API_BANDS)
+
+
+# -------------------- SIMULATOR --------------------
+# All band edges of all schemes split the percentage axis into cells: each
+# edge value itself and each open interval between neighbouring edges. Every
+# scheme gives one weight per cell, so a class is binned into cells once and
+# scored under every scheme with a single matrix product.
+def compile_schemes(schemes):
+    """(edges, weights matrix schemes x cells, banded matrix) for ``{name: bands}``"""
+    edges = np.unique([v for bands in schemes.values() for _, low, high, _ in bands for v in (low, high)])
+    # Cell 2p is the open interval below edges[p], cell 2p+1 is edges[p] itself;
+    # the last cell is above every edge and one more holds missing percentages.
+    reps = np.empty(2 * len(edges) + 1)
+    reps[1::2] = edges
+    reps[0] = edges[0] - 1
+    reps[-1] = edges[-1] + 1
+    reps[2:-1:2] = (edges[:-1] + edges[1:]) / 2
+
+    weights = np.zeros((len(schemes), len(reps) + 1))
+    banded = np.zeros((len(schemes), len(reps) + 1), dtype=bool)
+    for s, bands in enumerate(schemes.values()):
+        # Walk bands in reverse so the first matching band is written last
+        for _, low, high, weight in reversed(bands):
+            inside = np.r_[(reps >= low) & (reps <= high), False]
+            weights[s, inside] = weight
+            banded[s, inside] = True
+    return edges, weights, banded
+
+
+def percentage_cells(percentages, edges):
+    """Cell index of every percentage against the compiled edges"""
+    pct = np.asarray(percentages, dtype=float)
+    pos = np.searchsorted(edges, pct, side='left')
+    exact = (pos < len(edges)) & (edges[np.minimum(pos, len(edges) - 1)] == pct)
+    cells = 2 * pos + exact
+    return np.where(np.isnan(pct), 2 * len(edges) + 1, cells)
+
+
+def simulate(percentages, schemes=None, baseline='Current'):
+    """Comparison table of the class's API score under every scheme (default: all registered)"""
+    schemes = SCHEMES if schemes is None else schemes
+    columns = ['API Score', 'Change vs ' + baseline, 'Students Without Band']
+    pct = np.asarray(percentages, dtype=float)
+    if not schemes or not len(pct):
+        return pd.DataFrame(columns=columns, index=pd.Index(list(schemes), name='Scheme'))
+
+    edges, weights, banded = compile_schemes(schemes)
+    counts = np.bincount(percentage_cells(pct, edges), minlength=weights.shape[1])
+    scores = weights @ counts / len(pct) * 100
+    table = pd.DataFrame({
+        'API Score': scores,
+        'Students Without Band': len(pct) - banded.astype(np.int64) @ counts,
+    }, index=pd.Index(list(schemes), name='Scheme'))
+    base = table['API Score'].get(baseline, np.nan)
+    table.insert(1, columns[1], table['API Score'] - base)
+    return table
+
+
+# -------------------- UI --------------------
+def scheme_comparison(percentages, key):
+    """'What if' expander: registered schemes plus one typed in by the user"""
+    import streamlit as st
+
+    with st.expander("What if the bands were different?"):
+        text = st.text_area(
+            "Custom scheme (one band per line: label, low, high, weight)",
+            "\n".join(f"{label}, {low:g}, {high:g}, {weight:g}" for label, low, high, weight in API_BANDS),
+            key=f"scheme-{key}",
+        )
+        schemes = dict(SCHEMES)
+        try:
+            custom = parse_scheme(text)
+            if custom:
+                schemes['Custom'] = custom
+        except ValueError as e:
+            st.error(str(e))
+        st.dataframe(simulate(percentages, schemes))
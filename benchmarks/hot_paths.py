@@ -0,0 +1,198 @@
+"""Benchmarks for the scoring, bucketing, clustering and export hot paths.
+
+Synthetic classes are generated for every (students, subjects) pair and each
+stage is timed on its own with its peak traced memory. Results are written as
+JSON tagged with the git commit so runs can be compared across commits.
+
+    python benchmarks/hot_paths.py
+    python benchmarks/hot_paths.py --sizes 1000,1000000,5000000 --subjects 1,5,20
+    python benchmarks/hot_paths.py --stages score,classify --out before.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import band_schemes  # noqa: E402
+import clustering  # noqa: E402
+import export  # noqa: E402
+import ranking  # noqa: E402
+from api_scoring import (  # noqa: E402
+    calculate_api_from_percentage, classify_percentages, score_percentages, subject_totals,
+)
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_SUBJECTS = [1, 5]
+XLSX_MAX_ROWS = 1_048_575
+LEGACY_MAX_ROWS = 200_000
+
+
+# -------------------- SYNTHETIC CLASSES --------------------
+def make_class(students, subjects, seed=0):
+    """Class sheet with Name + ``subjects`` mark columns (two decimals, 0-100)"""
+    rng = np.random.default_rng(seed)
+    marks = np.clip(rng.normal(62, 18, size=(students, subjects)), 0, 100).round(2)
+    df = pd.DataFrame(marks, columns=[f'subject{i + 1}' for i in range(subjects)])
+    df.insert(0, 'name', [f'Student {i}' for i in range(students)])
+    return df
+
+
+# -------------------- LEGACY REFERENCES --------------------
+# The row-by-row implementations the apps used before vectorization, kept
+# here so the speedup stays measurable.
+LEGACY_CATEGORIES = [
+    (95, 100, 10), (90, 94.99, 8), (80, 89.99, 6), (70, 79.99, 4),
+    (60, 69.99, 2), (50, 59.99, 0), (33, 49.99, -1), (0, 32.99, -3),
+]
+
+
+def legacy_score(percentages):
+    total_weighted_score = 0
+    for pct in percentages:
+        for low, high, weight in LEGACY_CATEGORIES:
+            if low <= pct <= high:
+                total_weighted_score += weight
+                break
+    return (total_weighted_score / len(percentages)) * 100
+
+
+def legacy_division(pct):
+    if pct >= 95: return '>95'
+    elif pct >= 90: return '90-94.99'
+    elif pct >= 80: return '80-89.99'
+    elif pct >= 70: return '70-79.99'
+    elif pct >= 60: return '60-69.99'
+    elif pct >= 50: return '50-59.99'
+    elif pct >= 33: return '33-49.99'
+    else: return '<33'
+
+
+# -------------------- STAGES --------------------
+# Stages get the class sheet and its percentages, computed once per class
+# outside the timed region, so only 'totals' pays for computing them.
+def percentages(df):
+    cols = [c for c in df.columns if c != 'name']
+    return pd.Series(subject_totals(df, cols)[1])
+
+
+STAGES = {
+    'totals': lambda df, pct: subject_totals(df, [c for c in df.columns if c != 'name']),
+    'score': lambda df, pct: score_percentages(pct),
+    'api_only': lambda df, pct: calculate_api_from_percentage(pct),
+    'classify': lambda df, pct: classify_percentages(pct),
+    'simulate': lambda df, pct: band_schemes.simulate(pct),
+    'legacy_score': lambda df, pct: legacy_score(pct),
+    'legacy_division': lambda df, pct: pct.apply(legacy_division),
+    'rank': lambda df, pct: ranking.dense_rank(pct),
+    'rank_pandas': lambda df, pct: pct.rank(ascending=False, method='dense'),
+    'cluster_exact': lambda df, pct: clustering.fit_exact(pct.values),
+    'cluster_kmeans': lambda df, pct: clustering.fit_kmeans(pct.values),
+    'export_xlsx': lambda df, pct: export.write_xlsx({'Student Analysis': df}),
+    'export_csv': lambda df, pct: export.export_bytes('CSV', {'Student Analysis': df}),
+}
+
+
+def _skip_reason(stage, students):
+    if stage.startswith('legacy') and students > LEGACY_MAX_ROWS:
+        return f'legacy loops only run up to {LEGACY_MAX_ROWS} rows'
+    if stage == 'export_xlsx' and students > XLSX_MAX_ROWS:
+        return 'beyond the xlsx row limit'
+    if stage == 'cluster_kmeans':
+        try:
+            import sklearn  # noqa: F401
+        except ImportError:
+            return 'scikit-learn not installed'
+    return None
+
+
+def run_stage(stage, df, pct, repeat):
+    """Best wall time over ``repeat`` runs and peak traced memory of one run"""
+    fn = STAGES[stage]
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(df, pct)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(df, pct)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak
+
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _int_list(text):
+    return [int(float(v)) for v in text.split(',') if v]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=_int_list, default=DEFAULT_SIZES, help='students per class, comma-separated')
+    parser.add_argument('--subjects', type=_int_list, default=DEFAULT_SUBJECTS, help='subjects per class, comma-separated')
+    parser.add_argument('--stages', default=','.join(STAGES), help='stages to run, comma-separated')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--out', help='JSON results file (default: benchmarks/results/<commit>.json)')
+    args = parser.parse_args(argv)
+
+    stages = [s for s in args.stages.split(',') if s]
+    unknown = set(stages).difference(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    commit = git_commit()
+    results = []
+    print(f"{'stage':16} {'students':>10} {'subjects':>8} {'seconds':>10} {'peak MB':>9}")
+    for students in args.sizes:
+        for subjects in args.subjects:
+            df = make_class(students, subjects)
+            pct = percentages(df)
+            for stage in stages:
+                reason = _skip_reason(stage, students)
+                if reason:
+                    results.append({'stage': stage, 'students': students, 'subjects': subjects, 'skipped': reason})
+                    continue
+                seconds, peak = run_stage(stage, df, pct, args.repeat)
+                results.append({
+                    'stage': stage, 'students': students, 'subjects': subjects,
+                    'seconds': seconds, 'peak_bytes': peak,
+                })
+                print(f'{stage:16} {students:>10} {subjects:>8} {seconds:>10.4f} {peak / 2**20:>9.1f}')
+
+    out = args.out or os.path.join(ROOT, 'benchmarks', 'results', f"{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w') as fh:
+        json.dump({
+            'commit': commit,
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'repeat': args.repeat,
+            'results': results,
+        }, fh, indent=2)
+    print(f'Results written to {out}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Cold-start and rerun timing for the Streamlit apps.
+
+Each app script is executed in a fresh interpreter, the way a new container
+first serves it, then rerun in the same process the way Streamlit does on
+every widget click. pandas and streamlit are timed separately since every app
+needs them. Also reports which heavy optional modules the first page load
+pulled in.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --repeat 10 Overall_API_Final.py
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APPS = [
+    'Overall_API_Final.py', 'API_FINAL_VERSION.py', 'Overall_API.py', 'api_calculator.py',
+    'student_performance_analyzer.py', 'app.py', 'spa.py',
+]
+HEAVY_MODULES = ['sklearn', 'matplotlib', 'xlsxwriter', 'openpyxl']
+
+# Runs inside the child interpreter: first page load, then reruns.
+CHILD = r'''
+import json, logging, runpy, sys, time, warnings
+logging.disable(logging.CRITICAL)
+warnings.filterwarnings('ignore')
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import pandas, streamlit
+imports = time.perf_counter() - start
+start = time.perf_counter()
+runpy.run_path({script!r}, run_name='__main__')
+first = time.perf_counter() - start
+loaded = [m for m in {heavy!r} if m in sys.modules]
+reruns = []
+for _ in range(3):
+    start = time.perf_counter()
+    runpy.run_path({script!r}, run_name='__main__')
+    reruns.append(time.perf_counter() - start)
+print(json.dumps({{'imports': imports, 'first': first, 'rerun': min(reruns), 'loaded': loaded}}))
+'''
+
+
+def measure(script, repeat):
+    path = os.path.join(ROOT, script)
+    code = CHILD.format(root=ROOT, script=path, heavy=HEAVY_MODULES)
+    imports, firsts, reruns, loaded = [], [], [], []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        imports.append(result['imports'])
+        firsts.append(result['first'])
+        reruns.append(result['rerun'])
+        loaded = result['loaded']
+    return {
+        'app': script,
+        'pandas_streamlit_import_s': statistics.median(imports),
+        'first_load_s': statistics.median(firsts),
+        'rerun_s': statistics.median(reruns),
+        'heavy_modules_loaded': loaded,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('apps', nargs='*', default=APPS)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help='also write results to this file')
+    args = parser.parse_args(argv)
+
+    results = [measure(app, args.repeat) for app in args.apps]
+    print(f"{'app':36} {'pd+st import':>13} {'first load':>11} {'rerun':>9}  heavy modules loaded")
+    for r in results:
+        print(f"{r['app']:36} {r['pandas_streamlit_import_s']:>12.3f}s {r['first_load_s']:>10.3f}s {r['rerun_s']:>8.3f}s  "
+              f"{', '.join(r['heavy_modules_loaded']) or '-'}")
+    if args.json:
+        with open(args.json, 'w') as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
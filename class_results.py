@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+from api_scoring import DIVISION_ORDER, PERFORMANCE_ORDER, classify_percentages
+
+# -------------------- COMPACT CLASS RESULTS --------------------
+# A loaded class as a handful of flat arrays instead of a DataFrame of Python
+# objects: names are dictionary-encoded, so each distinct name is stored once,
+# labels are int8 codes into the rule orders, and percentages recorded to two
+# decimals are kept as int16 hundredths. Percentages with more precision stay
+# float64 -- float32 would move values across band edges such as 94.99.
+NAME_CODE_DTYPE = np.int32
+CENTI_MAX = np.iinfo(np.int16).max
+
+
+class StudentRecord:
+    __slots__ = ('name', 'percentage', 'division', 'performance')
+
+    def __init__(self, name, percentage, division, performance):
+        self.name = name
+        self.percentage = percentage
+        self.division = division
+        self.performance = performance
+
+    def __repr__(self):
+        return (f'StudentRecord(name={self.name!r}, percentage={self.percentage!r}, '
+                f'division={self.division!r}, performance={self.performance!r})')
+
+
+def _compact_marks(pct):
+    """(marks array, scale): int16 hundredths when that round-trips exactly, else float64 as is"""
+    finite = pct[~np.isnan(pct)]
+    if not finite.size:
+        return pct, 1
+    centi = np.round(finite * 100)
+    if finite.min() >= 0 and centi.max() <= CENTI_MAX and np.array_equal(centi / 100, finite):
+        if len(finite) == len(pct):
+            return np.round(pct * 100).astype(np.int16), 100
+    return pct, 1
+
+
+class ClassResults:
+    """Names, percentages, divisions and performance categories of one class in compact arrays.
+
+    Behaves as an array of percentages (``np.asarray(results)``), so the
+    scoring functions in api_scoring accept it directly.
+    """
+
+    __slots__ = ('name_table', 'name_codes', 'marks', 'scale', 'division_codes', 'performance_codes')
+
+    def __init__(self, names, percentages):
+        codes, uniques = pd.factorize(pd.Series(names).astype(str), sort=False)
+        self.name_table = uniques
+        self.name_codes = codes.astype(NAME_CODE_DTYPE)
+        pct = np.array(percentages, dtype=float)
+        self.marks, self.scale = _compact_marks(pct)
+        # Views handed out by np.asarray(results) must not change the container
+        self.marks.flags.writeable = False
+        bands = classify_percentages(pct)
+        self.division_codes = bands.division.codes.astype(np.int8)
+        self.performance_codes = bands.performance.codes.astype(np.int8)
+
+    @classmethod
+    def from_frame(cls, df, name_col='name', pct_col='percentage'):
+        return cls(df[name_col], df[pct_col])
+
+    def __len__(self):
+        return len(self.name_codes)
+
+    def __array__(self, dtype=None, copy=None):
+        pct = self.percentages
+        converts = self.scale != 1 or (dtype is not None and np.dtype(dtype) != pct.dtype)
+        if copy is False and converts:
+            raise ValueError('ClassResults percentages cannot be returned without a copy')
+        if dtype is not None:
+            pct = pct.astype(dtype, copy=False)
+        # Without a conversion this is the read-only internal buffer
+        return pct.copy() if copy and not converts else pct
+
+    @property
+    def percentages(self):
+        if self.scale == 1:
+            return self.marks
+        return self.marks / self.scale
+
+    @property
+    def names(self):
+        return self.name_table.take(self.name_codes)
+
+    @property
+    def division(self):
+        return pd.Categorical.from_codes(self.division_codes, categories=DIVISION_ORDER)
+
+    @property
+    def performance(self):
+        return pd.Categorical.from_codes(self.performance_codes, categories=PERFORMANCE_ORDER)
+
+    def __getitem__(self, i):
+        """StudentRecord at position ``i``; a slice gives a list of them"""
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        pct = self.marks[i] / self.scale if self.scale != 1 else self.marks[i]
+        return StudentRecord(
+            self.name_table[self.name_codes[i]],
+            float(pct),
+            DIVISION_ORDER[self.division_codes[i]],
+            PERFORMANCE_ORDER[self.performance_codes[i]],
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def nbytes(self):
+        """Array memory plus the distinct name strings"""
+        strings = self.name_table.memory_usage(deep=True)
+        return (self.name_codes.nbytes + self.marks.nbytes + self.division_codes.nbytes
+                + self.performance_codes.nbytes + strings)
+
+    def to_frame(self):
+        return pd.DataFrame({
+            'name': np.asarray(self.names),
+            'percentage': self.percentages,
+            'division': self.division,
+            'performance category': self.performance,
+        })
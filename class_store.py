@@ -0,0 +1,267 @@
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+from api_scoring import API_BANDS, DIVISION_ORDER, DIVISION_RULES
+from class_results import ClassResults
+from rollup import TOTAL_COLUMNS, finish
+
+# -------------------- CLASS RESULT STORE --------------------
+# One SQLite database holds every class's test results. Each row is keyed by
+# (class, student, assessment), so re-uploading an assessment replaces marks
+# instead of appending duplicate rows.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    class_name TEXT NOT NULL,
+    name TEXT NOT NULL,
+    assessment TEXT NOT NULL,
+    marks REAL,
+    PRIMARY KEY (class_name, name, assessment)
+);
+CREATE TABLE IF NOT EXISTS cluster_state (
+    class_name TEXT PRIMARY KEY,
+    centers TEXT NOT NULL,
+    counts TEXT NOT NULL,
+    last_rowid INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS class_version (
+    class_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS class_summary (
+    class_name TEXT PRIMARY KEY,
+    students INTEGER NOT NULL,
+    marked INTEGER NOT NULL,
+    marks_sum REAL NOT NULL,
+    weight_sum INTEGER NOT NULL,
+    divisions TEXT NOT NULL
+);
+"""
+
+# DataFrame column -> results column
+COLUMN_MAP = {'Name': 'name', 'Assessment': 'assessment', 'Marks': 'marks'}
+
+
+def connect(db_path):
+    folder = os.path.dirname(db_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def append_results(db_path, class_name, df, assessment):
+    """Upsert Name/Marks rows for one class; ``assessment`` is used where the sheet has no Assessment column"""
+    if 'Assessment' in df.columns:
+        assessments = df['Assessment'].fillna(assessment).astype(str)
+    else:
+        assessments = pd.Series(assessment, index=df.index)
+
+    marks = [None if pd.isna(m) else float(m) for m in pd.to_numeric(df['Marks'], errors='coerce')]
+    names = df['Name'].astype(str)
+    rows = zip([class_name] * len(df), names, assessments, marks)
+    keys = len(set(zip(names, assessments)))
+    with closing(connect(db_path)) as conn, conn:
+        before = _row_count(conn, class_name)
+        conn.executemany(
+            'INSERT INTO results (class_name, name, assessment, marks) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (class_name, name, assessment) DO UPDATE SET marks = excluded.marks',
+            rows,
+        )
+        if _row_count(conn, class_name) - before < keys:
+            # Replaced marks keep their rowid, so load_marks_since would never
+            # see them; drop the saved centers and let the next run refit
+            conn.execute('DELETE FROM cluster_state WHERE class_name = ?', (class_name,))
+        conn.execute(
+            'INSERT INTO class_version (class_name, version) VALUES (?, 1) '
+            'ON CONFLICT (class_name) DO UPDATE SET version = version + 1',
+            (class_name,),
+        )
+        _refresh_summary(conn, class_name)
+
+
+def _row_count(conn, class_name):
+    return conn.execute('SELECT COUNT(*) FROM results WHERE class_name = ?', (class_name,)).fetchone()[0]
+
+
+def load_results(db_path, class_name, columns=('Name', 'Marks')):
+    """Stored rows for one class with only the requested columns, or None when the class has none"""
+    if not os.path.exists(db_path):
+        return None
+    select = ', '.join(f'{COLUMN_MAP[col]} AS "{col}"' for col in columns)
+    with closing(connect(db_path)) as conn:
+        df = pd.read_sql_query(
+            f'SELECT {select} FROM results WHERE class_name = ? ORDER BY rowid',
+            conn, params=(class_name,),
+        )
+    return df if len(df) else None
+
+
+# -------------------- RESIDENT CLASSES --------------------
+# Recently analyzed classes stay in memory as compact ClassResults, so the
+# server keeps many classes resident instead of re-reading each one from the
+# database. Every save bumps the class's version, which also invalidates the
+# copies held by other processes sharing the database.
+RESIDENT_CLASSES = 64
+
+_resident = OrderedDict()
+_resident_lock = threading.Lock()
+
+
+def load_class_results(db_path, class_name):
+    """Stored Name/Marks of a class as ClassResults, served from memory while unchanged; None when empty"""
+    if not os.path.exists(db_path):
+        return None
+    key = (os.path.abspath(db_path), class_name)
+    with closing(connect(db_path)) as conn:
+        row = conn.execute('SELECT version FROM class_version WHERE class_name = ?', (class_name,)).fetchone()
+    version = row[0] if row else 0
+    with _resident_lock:
+        cached = _resident.get(key)
+        if cached is not None and cached[0] == version:
+            _resident.move_to_end(key)
+            return cached[1]
+
+    df = load_results(db_path, class_name)
+    results = None if df is None else ClassResults(df['Name'], df['Marks'])
+    with _resident_lock:
+        _resident[key] = (version, results)
+        _resident.move_to_end(key)
+        while len(_resident) > RESIDENT_CLASSES:
+            _resident.popitem(last=False)
+    return results
+
+
+def import_legacy_csv(db_path, class_name, csv_path):
+    """Move an old append-only student_performance.csv into the store once"""
+    if not os.path.exists(csv_path):
+        return
+    df = pd.read_csv(csv_path)
+    # The old Analyze button appended a copy of the whole history with its
+    # Cluster/Category filled in; those copies are the only labelled rows
+    labelled = [col for col in ('Cluster', 'Category') if col in df.columns]
+    if labelled:
+        df = df[df[labelled].isna().all(axis=1)]
+    if 'Assessment' not in df.columns:
+        # The old file had no assessment key; number each student's rows in order
+        df['Assessment'] = 'legacy-' + (df.groupby('Name').cumcount() + 1).astype(str)
+    append_results(db_path, class_name, df, 'legacy')
+    os.replace(csv_path, csv_path + '.imported')
+
+
+def load_marks_since(db_path, class_name, after_rowid=0):
+    """Marks appended to a class after ``after_rowid`` and the newest rowid seen"""
+    with closing(connect(db_path)) as conn:
+        rows = conn.execute(
+            'SELECT rowid, marks FROM results WHERE class_name = ? AND rowid > ? AND marks IS NOT NULL',
+            (class_name, after_rowid),
+        ).fetchall()
+    if not rows:
+        return np.empty(0), after_rowid
+    rowids, marks = zip(*rows)
+    return np.array(marks, dtype=float), max(rowids)
+
+
+def load_cluster_state(db_path, class_name):
+    """Persisted (centers, counts, last_rowid) for a class, or None"""
+    if not os.path.exists(db_path):
+        return None
+    with closing(connect(db_path)) as conn:
+        row = conn.execute(
+            'SELECT centers, counts, last_rowid FROM cluster_state WHERE class_name = ?', (class_name,)
+        ).fetchone()
+    if row is None:
+        return None
+    return np.array(json.loads(row[0]), dtype=float), np.array(json.loads(row[1]), dtype=np.int64), row[2]
+
+
+def save_cluster_state(db_path, class_name, centers, counts, last_rowid):
+    with closing(connect(db_path)) as conn, conn:
+        conn.execute(
+            'INSERT OR REPLACE INTO cluster_state (class_name, centers, counts, last_rowid) VALUES (?, ?, ?, ?)',
+            (class_name, json.dumps(np.asarray(centers).tolist()), json.dumps(np.asarray(counts).tolist()), last_rowid),
+        )
+
+
+# -------------------- CLASS SUMMARY INDEX --------------------
+# One row per class with its record count, marks sum, API weight sum and
+# division counts, rewritten in the same transaction as every save. Comparing
+# classes reads this table instead of every class's history. Marks are out
+# of 100, so they are scored as percentages; missing marks count as students
+# with no API weight and fall in the lowest division, as in api_scoring.
+_WEIGHT_SQL = 'CASE ' + ' '.join(
+    f'WHEN marks >= {low} AND marks <= {high} THEN {weight}' for _, low, high, weight in API_BANDS
+) + ' ELSE 0 END'
+_DIVISION_SQL = 'CASE ' + ' '.join(
+    f'WHEN marks >= {low} THEN {i}' for i, (low, _) in enumerate(DIVISION_RULES) if low is not None
+) + f' ELSE {len(DIVISION_RULES) - 1} END'
+
+SUMMARY_COLUMNS = ['Total Students', 'Mean Marks', 'API Score'] + DIVISION_ORDER
+
+
+def _refresh_summary(conn, class_name):
+    rows = conn.execute(
+        f'SELECT {_DIVISION_SQL} AS division, COUNT(*), COUNT(marks), COALESCE(SUM(marks), 0), SUM({_WEIGHT_SQL}) '
+        'FROM results WHERE class_name = ? GROUP BY division',
+        (class_name,),
+    ).fetchall()
+    divisions = [0] * len(DIVISION_ORDER)
+    students = marked = weight_sum = 0
+    marks_sum = 0.0
+    for division, count, with_marks, total, weight in rows:
+        divisions[division] = count
+        students += count
+        marked += with_marks
+        marks_sum += total
+        weight_sum += weight
+    conn.execute(
+        'INSERT OR REPLACE INTO class_summary (class_name, students, marked, marks_sum, weight_sum, divisions) '
+        'VALUES (?, ?, ?, ?, ?, ?)',
+        (class_name, students, marked, marks_sum, weight_sum, json.dumps(divisions)),
+    )
+
+
+def load_summary_totals(db_path, class_names):
+    """Mergeable summary row per class (rollup.TOTAL_COLUMNS), in the given order; classes without results are left out"""
+    frame = pd.DataFrame(columns=TOTAL_COLUMNS, index=pd.Index([], name='Class'))
+    if not os.path.exists(db_path) or not class_names:
+        return frame
+    placeholders = ', '.join('?' * len(class_names))
+    with closing(connect(db_path)) as conn, conn:
+        # Databases written before the index existed are summarized on first use
+        missing = conn.execute(
+            f'SELECT DISTINCT class_name FROM results WHERE class_name IN ({placeholders}) '
+            'AND class_name NOT IN (SELECT class_name FROM class_summary)',
+            list(class_names),
+        ).fetchall()
+        for (class_name,) in missing:
+            _refresh_summary(conn, class_name)
+        rows = conn.execute(
+            f'SELECT class_name, students, marked, marks_sum, weight_sum, divisions FROM class_summary '
+            f'WHERE class_name IN ({placeholders}) AND students > 0',
+            list(class_names),
+        ).fetchall()
+
+    if not rows:
+        return frame
+    order = {name: i for i, name in enumerate(class_names)}
+    records = {
+        class_name: [students, marked, marks_sum, weight_sum] + json.loads(divisions)
+        for class_name, students, marked, marks_sum, weight_sum, divisions in sorted(rows, key=lambda r: order[r[0]])
+    }
+    frame = pd.DataFrame.from_dict(records, orient='index', columns=TOTAL_COLUMNS)
+    frame.index.name = 'Class'
+    return frame
+
+
+def load_summaries(db_path, class_names):
+    """Summary row per class (Total Students, Mean Marks, API Score, division counts); classes without results are left out"""
+    return finish(load_summary_totals(db_path, class_names))[SUMMARY_COLUMNS]
@@ -0,0 +1,154 @@
+import numpy as np
+
+# -------------------- PERFORMANCE CLUSTERS --------------------
+# Clusters are always kept sorted by center, so the labels below map to the
+# lowest, middle and highest group regardless of how the model was fitted.
+CATEGORY_LABELS = ["Needs Improvement", "Average", "High Achiever"]
+NUM_CLUSTERS = len(CATEGORY_LABELS)
+
+
+def _sorted(centers, counts):
+    order = np.argsort(centers, kind='stable')
+    return centers[order], counts[order]
+
+
+def nearest_center(marks, centers):
+    """Index of the closest center for every mark; ``centers`` must be sorted"""
+    midpoints = (centers[1:] + centers[:-1]) / 2
+    return np.searchsorted(midpoints, np.asarray(marks, dtype=float))
+
+
+def fit_kmeans(marks, init_centers=None):
+    """Fit K-Means on the marks and return (sorted centers, points per cluster).
+
+    With ``init_centers`` the model is warm-started from them with a single
+    run instead of ten random restarts.
+    """
+    from sklearn.cluster import KMeans
+
+    marks = np.asarray(marks, dtype=float).reshape(-1, 1)
+    if init_centers is not None:
+        kmeans = KMeans(n_clusters=len(init_centers), init=np.reshape(init_centers, (-1, 1)), n_init=1)
+    else:
+        kmeans = KMeans(n_clusters=NUM_CLUSTERS, random_state=42, n_init=10)
+    labels = kmeans.fit_predict(marks)
+    counts = np.bincount(labels, minlength=kmeans.n_clusters)
+    return _sorted(kmeans.cluster_centers_.flatten(), counts)
+
+
+def update_centers(centers, counts, new_marks):
+    """Mini-batch update: fold new marks into the running mean of their nearest center"""
+    new_marks = np.asarray(new_marks, dtype=float)
+    if not len(new_marks):
+        return centers, counts
+    labels = nearest_center(new_marks, centers)
+    added = np.bincount(labels, minlength=len(centers))
+    sums = np.bincount(labels, weights=new_marks, minlength=len(centers))
+    new_counts = counts + added
+    new_centers = np.where(added > 0, (centers * counts + sums) / np.maximum(new_counts, 1), centers)
+    return _sorted(new_centers, new_counts)
+
+
+def assign_categories(marks, centers):
+    """Category label for every mark from sorted centers; missing marks stay empty"""
+    marks = np.asarray(marks, dtype=float)
+    labels = np.array(CATEGORY_LABELS, dtype=object)[nearest_center(marks, centers)]
+    labels[np.isnan(marks)] = None
+    return labels
+
+
+# -------------------- EXACT 1-D CLUSTERING --------------------
+# Marks are one-dimensional, so the optimal k-segmentation (minimum within-
+# cluster sum of squares) can be found exactly: sort, then dynamic programming
+# over contiguous runs. Identical marks are collapsed first, which keeps the
+# table small since marks are recorded to a fixed number of decimals.
+def _segment_costs(prefix_w, prefix_wx, prefix_wxx, starts, ends):
+    """Sum of squared deviations of values starts..ends (inclusive), elementwise"""
+    w = prefix_w[ends + 1] - prefix_w[starts]
+    wx = prefix_wx[ends + 1] - prefix_wx[starts]
+    wxx = prefix_wxx[ends + 1] - prefix_wxx[starts]
+    return np.maximum(wxx - wx * wx / w, 0)
+
+
+def fit_exact(marks, num_clusters=NUM_CLUSTERS):
+    """Optimal 1-D clustering of the marks; returns (sorted centers, points per cluster).
+
+    Deterministic, with no random restarts. Runs in O(n log n) for the sort
+    plus O(k * m log m) for the DP over the m distinct marks, using divide and
+    conquer on the monotone split points with each depth solved in one pass.
+    """
+    marks = np.asarray(marks, dtype=float)
+    values, weights = np.unique(marks[~np.isnan(marks)], return_counts=True)
+    m = len(values)
+    k = min(num_clusters, m)
+    if k == 0:
+        return np.empty(0), np.empty(0, dtype=np.int64)
+
+    prefix_w = np.concatenate(([0], np.cumsum(weights))).astype(float)
+    prefix_wx = np.concatenate(([0], np.cumsum(weights * values)))
+    prefix_wxx = np.concatenate(([0], np.cumsum(weights * values * values)))
+
+    # cost[i] = best cost of the first i+1 values in the current number of clusters
+    cost = _segment_costs(prefix_w, prefix_wx, prefix_wxx, np.zeros(m, dtype=np.int64), np.arange(m))
+    splits = [np.zeros(m, dtype=np.int64)]
+    for c in range(1, k):
+        prev = cost
+        cost = np.full(m, np.inf)
+        split = np.zeros(m, dtype=np.int64)
+
+        # Optimal split points are monotone in i, so solve the middle index of
+        # every open range and split each range in two with the narrowed set of
+        # candidate splits. All ranges at one depth are solved together, so a
+        # layer takes O(log m) vectorized passes of O(m) candidates each.
+        lo, hi = np.array([c]), np.array([m - 1])
+        opt_lo, opt_hi = np.array([c]), np.array([m - 1])
+        while len(lo):
+            mid = (lo + hi) // 2
+            sizes = np.minimum(mid, opt_hi) - opt_lo + 1
+            first = np.cumsum(sizes) - sizes
+            owner = np.repeat(np.arange(len(mid)), sizes)
+            starts = np.arange(sizes.sum()) - first[owner] + opt_lo[owner]
+            totals = prev[starts - 1] + _segment_costs(prefix_w, prefix_wx, prefix_wxx, starts, mid[owner])
+
+            # First minimum of every range, as argmin would pick it
+            best = np.minimum.reduceat(totals, first)
+            hits = np.flatnonzero(totals == best[owner])
+            hits = hits[np.r_[True, owner[hits][1:] != owner[hits][:-1]]]
+            cost[mid] = best
+            split[mid] = starts[hits]
+
+            lo, hi = np.r_[lo, mid + 1], np.r_[mid - 1, hi]
+            opt_lo, opt_hi = np.r_[opt_lo, split[mid]], np.r_[split[mid], opt_hi]
+            keep = lo <= hi
+            lo, hi, opt_lo, opt_hi = lo[keep], hi[keep], opt_lo[keep], opt_hi[keep]
+        splits.append(split)
+
+    # Walk the split table back from the last value
+    bounds = []
+    end = m - 1
+    for c in range(k - 1, -1, -1):
+        start = int(splits[c][end]) if c else 0
+        bounds.append((start, end))
+        end = start - 1
+    bounds.reverse()
+
+    counts = np.array([prefix_w[e + 1] - prefix_w[s] for s, e in bounds], dtype=np.int64)
+    centers = np.array([(prefix_wx[e + 1] - prefix_wx[s]) / (prefix_w[e + 1] - prefix_w[s]) for s, e in bounds])
+    return centers, counts
+
+
+# -------------------- BACKENDS --------------------
+# UI label -> backend key
+BACKENDS = {
+    'Exact 1-D (fast)': 'exact',
+    'K-Means (scikit-learn)': 'kmeans',
+}
+
+
+def fit_clusters(marks, backend='exact', init_centers=None):
+    """Fit the chosen backend; only K-Means uses ``init_centers`` (and imports scikit-learn)"""
+    if backend == 'exact':
+        return fit_exact(marks)
+    if backend == 'kmeans':
+        return fit_kmeans(marks, init_centers)
+    raise ValueError(f'Unknown clustering backend: {backend}')
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from ingestion import READ_WORKERS, iter_workbooks
+
+# -------------------- COMPARATIVE CATEGORIES --------------------
+CATEGORY_BINS = [0, 49.99, 59.99, 69.99, 79.99, 100]
+CATEGORY_LABELS = ["Remedial", "Scope to Become Average", "Average", "Scope to Become High Achiever", "High Achiever"]
+
+STAT_COLUMNS = ['count', 'sum', 'sum_sq', 'sum_t', 'sum_tt', 'sum_tx']
+
+
+# -------------------- RUNNING AGGREGATES --------------------
+class AssessmentAggregator:
+    """Per-student running sums over any number of assessments.
+
+    Each file is reduced to one row per student as soon as it is read, so only
+    the running totals are kept however many assessments are compared. ``t``
+    is the assessment's position, used for the optional trend.
+    """
+
+    def __init__(self):
+        self.stats = None
+        self.assessments = 0
+
+    def add(self, df, t=None):
+        t = self.assessments if t is None else t
+        marks = df['Marks']
+        per_student = pd.DataFrame({
+            'Name': df['Name'],
+            'count': marks.notna().astype(np.int64),
+            'sum': marks.fillna(0),
+            'sum_sq': marks.fillna(0) ** 2,
+        }).groupby('Name').sum()
+        per_student['sum_t'] = per_student['count'] * t
+        per_student['sum_tt'] = per_student['count'] * t * t
+        per_student['sum_tx'] = per_student['sum'] * t
+
+        self.stats = per_student if self.stats is None else self.stats.add(per_student, fill_value=0)
+        self.assessments += 1
+        return self
+
+    def summary(self, spread=False, trend=False):
+        """Mean mark and category per student; optionally the standard deviation and per-assessment trend"""
+        s = self.stats.sort_index()
+        count = s['count'].replace(0, np.nan)
+        mean = s['sum'] / count
+        result = pd.DataFrame({'Name': s.index, 'Marks': mean.values})
+        result['Category'] = pd.cut(result['Marks'], bins=CATEGORY_BINS, labels=CATEGORY_LABELS)
+        if spread:
+            variance = (s['sum_sq'] / count - mean ** 2).clip(lower=0)
+            result['Std Dev'] = np.sqrt(variance).values
+        if trend:
+            # Least-squares slope of mark against assessment position
+            denom = s['count'] * s['sum_tt'] - s['sum_t'] ** 2
+            slope = (s['count'] * s['sum_tx'] - s['sum_t'] * s['sum']) / denom.replace(0, np.nan)
+            result['Trend'] = slope.values
+        return result
+
+
+# -------------------- PARALLEL READING --------------------
+def iter_assessment_files(files, workers=READ_WORKERS, processes=False):
+    """Parse Name/Marks sheets concurrently, yielding (position, file, df, error) in upload order.
+
+    Yielding in order keeps the running sums, and so the results, deterministic.
+    Unreadable files and files without Name/Marks come back with an error
+    message instead of a frame.
+    """
+    for i, file, df, error in iter_workbooks(files, ['Name', 'Marks'], workers=workers, processes=processes):
+        if error is None and not {'Name', 'Marks'}.issubset(df.columns):
+            df, error = None, "must contain 'Name' and 'Marks' columns."
+        yield i, file, df, error
@@ -0,0 +1,117 @@
+import importlib.util
+from io import BytesIO
+
+import result_cache
+from instrumentation import stage
+
+# -------------------- REPORT EXPORT --------------------
+XLSX_MIME = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Format -> (file extension, mime type)
+EXPORT_FORMATS = {
+    'Excel': ('.xlsx', XLSX_MIME),
+    'CSV': ('.csv', 'text/csv'),
+    'Parquet': ('.parquet', 'application/vnd.apache.parquet'),
+}
+
+ROW_CHUNK = 10_000
+DATE_FORMAT = 'yyyy-mm-dd'
+
+
+def available_formats():
+    """Export formats usable here; Parquet needs pyarrow or fastparquet"""
+    formats = ['Excel', 'CSV']
+    if importlib.util.find_spec('pyarrow') or importlib.util.find_spec('fastparquet'):
+        formats.append('Parquet')
+    return formats
+
+
+def _column_values(series):
+    # Plain Python values; missing cells become None, which xlsxwriter leaves blank
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def write_xlsx(sheets, constant_memory=True):
+    """Workbook bytes for ``{sheet name: DataFrame}``, streamed row by row.
+
+    In constant-memory mode xlsxwriter flushes each row to a temp file as
+    soon as the next one starts, so memory stays flat however large the
+    class is.
+    """
+    import xlsxwriter
+
+    output = BytesIO()
+    # Date cells (datetime / pd.Timestamp) are written as Excel dates, not serial numbers
+    workbook = xlsxwriter.Workbook(output, {
+        'constant_memory': constant_memory,
+        'default_date_format': DATE_FORMAT,
+        'remove_timezone': True,
+    })
+    header = workbook.add_format({'bold': True})
+    for sheet_name, df in sheets.items():
+        worksheet = workbook.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, [str(col) for col in df.columns], header)
+        row = 1
+        for start in range(0, len(df), ROW_CHUNK):
+            chunk = df.iloc[start:start + ROW_CHUNK]
+            for values in zip(*(_column_values(chunk[col]) for col in chunk.columns)):
+                worksheet.write_row(row, 0, values)
+                row += 1
+    workbook.close()
+    return output.getvalue()
+
+
+def export_bytes(fmt, sheets):
+    """Encode a report; CSV and Parquet carry only the first (student) sheet"""
+    with stage(f'export:{fmt}', sum(len(df) for df in sheets.values())):
+        return _encode(fmt, sheets)
+
+
+def _encode(fmt, sheets):
+    if fmt == 'Excel':
+        return write_xlsx(sheets)
+    df = next(iter(sheets.values()))
+    if fmt == 'CSV':
+        return df.to_csv(index=False).encode('utf-8')
+    if fmt == 'Parquet':
+        output = BytesIO()
+        df.to_parquet(output, index=False)
+        return output.getvalue()
+    raise ValueError(f'Unknown export format: {fmt}')
+
+
+# -------------------- LAZY DOWNLOAD --------------------
+def lazy_download_button(label, build, file_name, mime, key):
+    """Download button whose bytes are only built when it is clicked.
+
+    Streamlit calls ``build`` on the click, so nothing is encoded on reruns
+    and no copy of the export is kept in the session.
+    """
+    import streamlit as st
+
+    st.download_button(label, build, file_name, mime, key=f'download-{key}')
+
+
+def report_download(label, sheets_builder, base_name, key, cache_key=None):
+    """Format picker plus lazy download for a multi-sheet report.
+
+    With ``cache_key`` the encoded report is shared through result_cache, so
+    a report already built (by any replica) is offered straight away.
+    """
+    import streamlit as st
+
+    fmt = st.radio('Download format', available_formats(), horizontal=True, key=f'format-{key}')
+    ext, mime = EXPORT_FORMATS[fmt]
+    if cache_key is not None:
+        cached = result_cache.get_bytes(cache_key, fmt)
+        if cached is not None:
+            st.download_button(label, cached, base_name + ext, mime, key=f'download-{key}-{fmt}')
+            return
+
+    def build():
+        data = export_bytes(fmt, sheets_builder())
+        if cache_key is not None:
+            result_cache.put_bytes(cache_key, fmt, data)
+        return data
+
+    lazy_download_button(label, build, base_name + ext, mime, f'{key}-{fmt}')
@@ -0,0 +1,146 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+
+import pandas as pd
+
+# -------------------- COMMON UTILITIES --------------------
+def normalize_headers(df):
+    df.columns = df.columns.str.strip().str.lower()
+    return df
+
+# -------------------- PARSED WORKBOOK CACHE --------------------
+# Streamlit reruns the whole script on every widget click; parsed sheets are
+# kept here keyed by the uploaded content so reruns skip openpyxl entirely.
+CACHE_SIZE = 16
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def file_bytes(file):
+    """Raw bytes of an uploaded file, a path or a bytes object"""
+    if isinstance(file, (bytes, bytearray)):
+        return bytes(file)
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as fh:
+            return fh.read()
+    if hasattr(file, 'getvalue'):
+        return file.getvalue()
+    data = file.read()
+    file.seek(0)
+    return data
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def upload_hash(file):
+    """Content hash of an uploaded file, for keying per-upload state"""
+    return content_hash(file_bytes(file))
+
+
+def _parse(data, columns, normalize):
+    usecols = None
+    if columns:
+        wanted = set(columns)
+        if normalize:
+            usecols = lambda col: str(col).strip().lower() in wanted
+        else:
+            usecols = lambda col: col in wanted
+    df = pd.read_excel(BytesIO(data), usecols=usecols)
+    return normalize_headers(df) if normalize else df
+
+
+def _cache_get(key):
+    with _cache_lock:
+        df = _cache.get(key)
+        if df is not None:
+            _cache.move_to_end(key)
+        return df
+
+
+def _cache_put(key, df):
+    with _cache_lock:
+        _cache[key] = df
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def read_workbook(file, columns=None, normalize=False, cache=True):
+    """Parse an uploaded workbook once and serve later reruns from the cache.
+
+    Only ``columns`` are parsed when given; with ``normalize`` they are matched
+    against stripped, lower-cased headers. Callers get their own copy. With
+    ``cache=False`` the sheet is parsed without touching the cache.
+    """
+    data = file_bytes(file)
+    if not cache:
+        return _parse(data, columns, normalize)
+    key = (content_hash(data), tuple(columns) if columns else None, normalize)
+
+    df = _cache_get(key)
+    if df is None:
+        df = _parse(data, columns, normalize)
+        _cache_put(key, df)
+
+    return df.copy()
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+# -------------------- CONCURRENT LOADING --------------------
+READ_WORKERS = 4
+
+
+def _error_message(e):
+    return str(e) or type(e).__name__
+
+
+def _read_in_process(pool, file, columns, normalize):
+    # Only the bytes cross the process boundary; the parsed frame comes back
+    return pool.submit(_parse, file_bytes(file), columns, normalize).result()
+
+
+def _result(i, file, future):
+    try:
+        return i, file, future.result(), None
+    except Exception as e:
+        return i, file, None, _error_message(e)
+
+
+def iter_workbooks(files, columns=None, normalize=False, workers=READ_WORKERS, processes=False):
+    """Parse many uploads concurrently, yielding (position, file, df, error) in upload order.
+
+    A file that fails to parse yields ``df=None`` and its error message rather
+    than stopping the batch. ``processes`` parses in a process pool, which
+    sidesteps the GIL for openpyxl-heavy batches. At most ``2 * workers``
+    files are read ahead of the consumer and the parse cache is bypassed, so
+    only a few parsed sheets are held at once however many are uploaded.
+    """
+    if processes:
+        parse_pool = ProcessPoolExecutor(max_workers=workers)
+        read = lambda file: _read_in_process(parse_pool, file, columns, normalize)
+    else:
+        parse_pool = None
+        read = lambda file: read_workbook(file, columns, normalize, cache=False)
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        for i, file in enumerate(files):
+            pending.append((i, file, pool.submit(read, file)))
+            if len(pending) >= 2 * workers:
+                yield _result(*pending.popleft())
+        while pending:
+            yield _result(*pending.popleft())
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        if parse_pool is not None:
+            parse_pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,165 @@
+import contextvars
+import functools
+import json
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+
+# -------------------- STAGE TIMINGS --------------------
+# Each calculation runs inside ``timed_run``; the ``stage`` blocks inside it
+# record wall time, rows handled and the change in resident memory. Every
+# stage is also logged as one JSON line on the 'api_calculator.stages' logger
+# (set API_TIMING_LOG=- for stderr or a file path to collect them).
+logger = logging.getLogger('api_calculator.stages')
+
+try:
+    PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    PAGE_SIZE = 4096
+
+_current_run = contextvars.ContextVar('current_run', default=None)
+
+
+def rss_bytes():
+    """Resident set size of this process from /proc/self/statm; None where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as fh:
+            return int(fh.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StageRecord:
+    __slots__ = ('run', 'run_id', 'stage', 'rows', 'seconds', 'rss_delta', 'ok')
+
+    def __init__(self, run, run_id, stage, rows=None):
+        self.run = run
+        self.run_id = run_id
+        self.stage = stage
+        self.rows = rows
+        self.seconds = None
+        self.rss_delta = None
+        self.ok = True
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Timeline:
+    """Stage records of one calculation run"""
+
+    def __init__(self, name):
+        self.name = name
+        self.run_id = uuid.uuid4().hex[:12]
+        self.stages = []
+
+    @property
+    def total_seconds(self):
+        return sum(s.seconds or 0 for s in self.stages)
+
+    def to_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame(
+            [(s.stage, s.rows, s.seconds, s.rss_delta, s.ok) for s in self.stages],
+            columns=['Stage', 'Rows', 'Seconds', 'RSS Delta (bytes)', 'OK'],
+        )
+
+
+def _log(payload):
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(payload, default=str))
+
+
+@contextmanager
+def stage(name, rows=None):
+    """Time one stage; set ``.rows`` on the yielded record when the count is only known afterwards"""
+    timeline = _current_run.get()
+    record = StageRecord(
+        timeline.name if timeline else None,
+        timeline.run_id if timeline else None,
+        name,
+        rows,
+    )
+    rss_before = rss_bytes()
+    start = time.perf_counter()
+    try:
+        yield record
+    except BaseException:
+        record.ok = False
+        raise
+    finally:
+        record.seconds = time.perf_counter() - start
+        rss_after = rss_bytes()
+        if rss_before is not None and rss_after is not None:
+            record.rss_delta = rss_after - rss_before
+        if timeline is not None:
+            timeline.stages.append(record)
+        _log({'event': 'stage', **record.as_dict()})
+
+
+@contextmanager
+def timed_run(name, panel=True):
+    """Collect the stages of one calculation; optionally show them in the sidebar debug panel"""
+    timeline = Timeline(name)
+    token = _current_run.set(timeline)
+    try:
+        yield timeline
+    finally:
+        _current_run.reset(token)
+        _log({
+            'event': 'run', 'run': name, 'run_id': timeline.run_id,
+            'seconds': timeline.total_seconds, 'stages': len(timeline.stages),
+        })
+        if panel:
+            debug_panel(timeline)
+
+
+def instrumented(name):
+    """Decorator running the whole function inside ``timed_run(name)``"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed_run(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# -------------------- DEBUG PANEL --------------------
+def debug_enabled():
+    """Debug panel switch: API_DEBUG=1 in the environment or ?debug=1 in the app URL"""
+    import streamlit as st
+
+    if os.environ.get('API_DEBUG') == '1':
+        return True
+    try:
+        return st.query_params.get('debug') == '1'
+    except Exception:
+        return False
+
+
+def debug_panel(timeline):
+    """Sidebar table of the run's stage timings when debugging is switched on"""
+    import streamlit as st
+
+    if not debug_enabled():
+        return
+    with st.sidebar.expander(f"Stage timings: {timeline.name} ({timeline.total_seconds * 1000:.1f} ms)", expanded=True):
+        st.dataframe(timeline.to_frame(), hide_index=True)
+
+
+def configure_logging(target=None):
+    """Send stage logs to stderr ('-') or a file; defaults to $API_TIMING_LOG"""
+    target = target if target is not None else os.environ.get('API_TIMING_LOG')
+    if not target or logger.handlers:
+        return
+    handler = logging.StreamHandler() if target == '-' else logging.FileHandler(target)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+configure_logging()
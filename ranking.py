@@ -0,0 +1,121 @@
+from bisect import bisect_left, bisect_right, insort
+
+import numpy as np
+
+# -------------------- DENSE RANKING --------------------
+# Dense rank, highest percentage first: rank = 1 + number of distinct
+# percentages above this one, the same as
+# ``Series.rank(ascending=False, method='dense')``.
+
+
+def dense_rank(percentages):
+    """Dense rank (1 = highest) of every percentage in one sort; missing percentages get rank 0"""
+    pct = np.asarray(percentages, dtype=float)
+    values = np.unique(pct[~np.isnan(pct)])
+    ranks = len(values) - np.searchsorted(values, pct, side='right') + 1
+    return np.where(np.isnan(pct), 0, ranks).astype(np.int64)
+
+
+class RankIndex:
+    """Dense-rank index over one cohort that can be updated a student at a time.
+
+    Distinct percentages are kept in a sorted list, so a student's rank is a
+    binary search over the distinct values and top-K only walks the highest
+    ones. With marks recorded to two decimals there are at most 10,001
+    distinct values however large the cohort is, which keeps inserts cheap.
+    """
+
+    def __init__(self):
+        self._values = []    # distinct percentages, ascending
+        self._members = {}   # percentage -> {student: None}, in insertion order
+        self._scores = {}    # student -> percentage
+
+    @classmethod
+    def from_scores(cls, students, percentages):
+        index = cls()
+        for student, pct in zip(students, np.asarray(percentages, dtype=float).tolist()):
+            # A repeated student keeps their last percentage, as with update()
+            index._scores.pop(student, None)
+            if pct == pct:
+                index._scores[student] = pct
+        for student, pct in index._scores.items():
+            index._members.setdefault(pct, {})[student] = None
+        index._values = sorted(index._members)
+        return index
+
+    def __len__(self):
+        return len(self._scores)
+
+    def __contains__(self, student):
+        return student in self._scores
+
+    def update(self, student, pct):
+        """Insert a student or change their percentage; a missing percentage removes them"""
+        self.remove(student)
+        pct = float(pct)
+        if pct != pct:
+            return
+        self._scores[student] = pct
+        members = self._members.get(pct)
+        if members is None:
+            members = self._members[pct] = {}
+            insort(self._values, pct)
+        members[student] = None
+
+    def remove(self, student):
+        pct = self._scores.pop(student, None)
+        if pct is None:
+            return
+        members = self._members[pct]
+        del members[student]
+        if not members:
+            del self._members[pct]
+            del self._values[bisect_left(self._values, pct)]
+
+    def rank_of(self, pct):
+        """Dense rank a percentage would have in this cohort"""
+        return len(self._values) - bisect_right(self._values, float(pct)) + 1
+
+    def rank(self, student):
+        return self.rank_of(self._scores[student])
+
+    def score(self, student):
+        return self._scores[student]
+
+    def top(self, k):
+        """First ``k`` students by rank as (student, percentage, rank); ties keep insertion order"""
+        result = []
+        for rank, pct in enumerate(reversed(self._values), start=1):
+            for student in self._members[pct]:
+                if len(result) == k:
+                    return result
+                result.append((student, pct, rank))
+        return result
+
+
+class CohortRanking:
+    """One RankIndex per cohort (section, grade, school, district, ...)"""
+
+    def __init__(self):
+        self.cohorts = {}
+
+    @classmethod
+    def from_frame(cls, df, cohort_col, name_col, pct_col):
+        ranking = cls()
+        for cohort, group in df.groupby(cohort_col, sort=False):
+            ranking.cohorts[cohort] = RankIndex.from_scores(group[name_col], group[pct_col])
+        return ranking
+
+    def update(self, cohort, student, pct):
+        self.cohorts.setdefault(cohort, RankIndex()).update(student, pct)
+
+    def remove(self, cohort, student):
+        if cohort in self.cohorts:
+            self.cohorts[cohort].remove(student)
+
+    def rank(self, cohort, student):
+        return self.cohorts[cohort].rank(student)
+
+    def top(self, cohort, k):
+        index = self.cohorts.get(cohort)
+        return index.top(k) if index is not None else []
@@ -0,0 +1,120 @@
+import os
+import pickle
+import tempfile
+import time
+
+from api_scoring import BAND_SCHEME_VERSION
+
+# -------------------- SHARED RESULT CACHE --------------------
+# Scored frames and export bytes on disk, keyed by (upload content hash, mode,
+# band-scheme version), so every replica sharing the directory can answer a
+# repeat upload without re-parsing or re-exporting it. Files are written to a
+# temp name and moved into place with os.replace, so readers in other
+# processes see either the old entry or the whole new one. A hit refreshes the
+# file's mtime; once the directory is over CACHE_MAX_BYTES the least recently
+# used entries are removed. Entries are pickles: point API_RESULT_CACHE only at
+# a directory the app alone can write to.
+CACHE_DIR = os.environ.get('API_RESULT_CACHE', '.result_cache')
+CACHE_MAX_BYTES = int(os.environ.get('API_RESULT_CACHE_BYTES', 512 * 2**20))
+
+
+def cache_key(content_hash, mode, scheme=BAND_SCHEME_VERSION):
+    return f'{content_hash}-{mode}-{scheme}'
+
+
+def _path(name, cache_dir):
+    return os.path.join(cache_dir or CACHE_DIR, name)
+
+
+def _read(name, cache_dir=None):
+    path = _path(name, cache_dir)
+    try:
+        with open(path, 'rb') as fh:
+            data = fh.read()
+        os.utime(path)
+    except OSError:
+        # Missing, or evicted by another process between open and utime
+        return None
+    return data
+
+
+def _write(name, data, cache_dir=None):
+    cache_dir = cache_dir or CACHE_DIR
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(data)
+        os.replace(tmp, _path(name, cache_dir))
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return
+    evict(cache_dir=cache_dir)
+
+
+def get_frame(key, cache_dir=None):
+    """Cached scored frame, or None"""
+    data = _read(f'{key}.frame.pkl', cache_dir)
+    if data is None:
+        return None
+    try:
+        return pickle.loads(data)
+    except Exception:
+        return None
+
+
+def put_frame(key, df, cache_dir=None):
+    _write(f'{key}.frame.pkl', pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL), cache_dir)
+
+
+def get_bytes(key, fmt, cache_dir=None):
+    """Cached export bytes for ``fmt``, or None"""
+    return _read(f'{key}.{fmt.lower()}.bin', cache_dir)
+
+
+def put_bytes(key, fmt, data, cache_dir=None):
+    _write(f'{key}.{fmt.lower()}.bin', data, cache_dir)
+
+
+def evict(max_bytes=None, cache_dir=None):
+    """Remove least recently used entries until the directory fits in ``max_bytes``"""
+    cache_dir = cache_dir or CACHE_DIR
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    entries = []
+    now = time.time()
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if entry.name.startswith('.tmp-'):
+                    # Left behind by a writer that died mid-write
+                    if now - stat.st_mtime > 3600:
+                        _remove(entry.path)
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        _remove(path)
+        total -= size
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def clear(cache_dir=None):
+    evict(0, cache_dir)
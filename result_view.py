@@ -0,0 +1,62 @@
+import math
+
+# -------------------- PAGED RESULT VIEW --------------------
+# Large classes are shown one page at a time: only the visible slice is sent
+# to the browser on each rerun, while the full frame stays in the report
+# download.
+PAGE_SIZE = 50
+TOP_N = 10
+
+
+def search_names(df, query, name_col='name'):
+    """Rows whose name contains ``query`` (case-insensitive, plain text)"""
+    query = (query or '').strip()
+    if not query:
+        return df
+    names = df[name_col].astype(str)
+    return df[names.str.contains(query, case=False, regex=False).to_numpy()]
+
+
+def top_per_group(df, group_col, sort_col, n=TOP_N):
+    """Highest ``n`` rows by ``sort_col`` within every group, groups in their category order"""
+    top = df.sort_values(sort_col, ascending=False, kind='stable')
+    top = top.groupby(group_col, observed=True, sort=False).head(n)
+    return top.sort_values(group_col, kind='stable')
+
+
+def page_count(rows, page_size=PAGE_SIZE):
+    return max(1, math.ceil(rows / page_size))
+
+
+def page_slice(df, page, page_size=PAGE_SIZE):
+    """Rows of 1-based ``page``"""
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size]
+
+
+def paged_table(df, key, name_col='name', group_col=None, sort_col=None, page_size=PAGE_SIZE):
+    """Searchable, paged table; with ``group_col`` it can also show the top students per group"""
+    import streamlit as st
+
+    query = st.text_input('Search by name', key=f'{key}-search')
+    view = df
+    if group_col is not None:
+        modes = ['All students', f'Top {TOP_N} per {group_col}']
+        if st.radio('Show', modes, horizontal=True, key=f'{key}-mode') == modes[1]:
+            view = top_per_group(view, group_col, sort_col)
+    view = search_names(view, query, name_col)
+
+    pages = page_count(len(view), page_size)
+    page = 1
+    if pages > 1:
+        page = int(st.number_input(f'Page (of {pages})', min_value=1, max_value=pages, value=1, key=f'{key}-page-{pages}'))
+    visible = page_slice(view, page, page_size)
+
+    if len(view):
+        start = (page - 1) * page_size
+        st.caption(f'Showing {start + 1}-{start + len(visible)} of {len(view)} students')
+    else:
+        st.caption('No matching students')
+    st.dataframe(visible)
+    return visible
+
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from api_scoring import BAND_WEIGHTS, DIVISION_ORDER
+
+# -------------------- MERGEABLE SUMMARIES --------------------
+# The API score is a weighted mean over band counts, so it cannot be averaged
+# across classes. Every column below, though, is a plain sum: a section's
+# summary is merged into its grade, school and district by adding rows, and
+# the API score and mean are derived only at the end.
+TOTAL_COLUMNS = ['Total Students', 'Marked', 'Marks Sum', 'Weight Sum'] + DIVISION_ORDER
+DERIVED_COLUMNS = ['Mean Marks', 'API Score']
+
+LEVELS = ['District', 'School', 'Grade', 'Section']
+
+
+def tally_totals(tally):
+    """Summary row of a ScoreTally"""
+    return dict(zip(TOTAL_COLUMNS, [
+        tally.total_students,
+        tally.marked,
+        tally.percentage_sum,
+        int(tally.band_counts @ BAND_WEIGHTS),
+        *tally.division_counts.tolist(),
+    ]))
+
+
+def summary_frame(items, levels=LEVELS):
+    """Frame of summary rows from ``(path, tally)`` pairs; ``path`` gives one key per level"""
+    rows = [dict(zip(levels, path), **tally_totals(tally)) for path, tally in items]
+    return pd.DataFrame(rows, columns=list(levels) + TOTAL_COLUMNS)
+
+
+def finish(totals):
+    """Add Mean Marks and API Score to summed rows"""
+    totals = totals.copy()
+    students = totals['Total Students'].astype(float)
+    totals['Mean Marks'] = totals['Marks Sum'] / totals['Marked'].astype(float).replace(0, np.nan)
+    totals['API Score'] = totals['Weight Sum'] / students.replace(0, np.nan) * 100
+    return totals
+
+
+def roll_up(summaries, levels=LEVELS):
+    """Summaries at every level, from the finest up to the overall total.
+
+    ``summaries`` has one row per leaf (e.g. section) with the level columns
+    and TOTAL_COLUMNS. Each level is merged from the one below it, so student
+    rows are never rescanned. Returns ``{level: frame}`` indexed by the level
+    path, plus 'All' for the grand total.
+    """
+    levels = list(levels)
+    result = {}
+    current = summaries.groupby(levels, sort=True, dropna=False)[TOTAL_COLUMNS].sum()
+    result[levels[-1]] = finish(current)
+    for depth in range(len(levels) - 1, 0, -1):
+        current = current.groupby(level=list(range(depth)), sort=True, dropna=False).sum()
+        result[levels[depth - 1]] = finish(current)
+    result['All'] = finish(pd.DataFrame([current.sum()], index=['All']).astype(current.dtypes.to_dict()))
+    return result
@@ -0,0 +1,301 @@
+"""Sharded scoring through a SQLite job queue, for result days too large for one process.
+
+    python score_queue.py submit queue.db --job board-2026 exports/*.csv --subjects subject1,subject2
+    python score_queue.py work queue.db            # start as many as you like, anywhere the files are visible
+    python score_queue.py status queue.db --job board-2026
+    python score_queue.py merge queue.db --job board-2026 -o board_summary.csv
+    python score_queue.py run queue.db --job board-2026 exports/*.csv -j 8   # submit + local workers + merge
+
+Each file is one shard. Workers lease a shard, stream-score it into a partial
+band summary and store it; the coordinator merges the partials. A worker that
+dies loses its lease when it expires and the shard is picked up again, while
+shards already done are never rescored. Workers on other hosts need the queue
+database on a filesystem with working SQLite locking.
+"""
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from multiprocessing import Process
+
+import pandas as pd
+
+from api_scoring import DIVISION_ORDER, ScoreTally
+from streaming import CHUNK_SIZE, stream_score
+
+LEASE_SECONDS = 120
+MAX_ATTEMPTS = 3
+POLL_SECONDS = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS shards (
+    shard_id INTEGER PRIMARY KEY,
+    job TEXT NOT NULL,
+    path TEXT NOT NULL,
+    subject_cols TEXT NOT NULL,
+    max_marks REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    partial TEXT,
+    UNIQUE (job, path)
+);
+CREATE INDEX IF NOT EXISTS shards_by_status ON shards (status, lease_expires);
+"""
+
+SHARD_COLUMNS = ['Shard', 'Status', 'API Score', 'Total Students'] + DIVISION_ORDER + ['Error']
+
+
+def connect(db_path):
+    conn = sqlite3.connect(db_path, timeout=60, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+# -------------------- COORDINATOR --------------------
+def submit(db_path, job, paths, subject_cols=('marks',), max_marks=100):
+    """Queue one shard per file; files already queued for the job are left as they are"""
+    rows = [(job, os.path.abspath(p), json.dumps(list(subject_cols)), max_marks) for p in paths]
+    with closing(connect(db_path)) as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        before = conn.total_changes
+        conn.executemany(
+            'INSERT OR IGNORE INTO shards (job, path, subject_cols, max_marks) VALUES (?, ?, ?, ?)', rows,
+        )
+        added = conn.total_changes - before
+        conn.execute('COMMIT')
+    return added
+
+
+def job_status(db_path, job):
+    """Shard count per status"""
+    with closing(connect(db_path)) as conn:
+        rows = conn.execute('SELECT status, COUNT(*) FROM shards WHERE job = ? GROUP BY status', (job,)).fetchall()
+    return dict(rows)
+
+
+def merge(db_path, job):
+    """(merged ScoreTally over finished shards, per-shard summary frame)"""
+    with closing(connect(db_path)) as conn:
+        rows = conn.execute(
+            'SELECT path, status, partial, error FROM shards WHERE job = ? ORDER BY shard_id', (job,),
+        ).fetchall()
+
+    total = ScoreTally()
+    records = []
+    for path, status, partial, error in rows:
+        record = {'Shard': path, 'Status': status, 'Error': error}
+        if partial is not None:
+            tally = ScoreTally.from_dict(json.loads(partial))
+            total.merge(tally)
+            record.update({'API Score': tally.api_score, 'Total Students': tally.total_students})
+            record.update(tally.division_distribution())
+        records.append(record)
+    shards = pd.DataFrame(records).reindex(columns=SHARD_COLUMNS)
+    count_cols = ['Total Students'] + DIVISION_ORDER
+    shards[count_cols] = shards[count_cols].astype('Int64')
+    return total, shards
+
+
+# -------------------- WORKER --------------------
+def _job_filter(job):
+    # SQL condition and parameters restricting a query to one job (None: every job)
+    return ('job = ? AND ', (job,)) if job is not None else ('', ())
+
+
+def claim(conn, owner, lease_seconds=LEASE_SECONDS, job=None):
+    """Lease the next pending (or abandoned) shard of ``job`` (default: any job).
+
+    Returns (shard_id, path, subject_cols, max_marks) or None.
+    """
+    now = time.time()
+    where, params = _job_filter(job)
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        # A shard whose worker died on every attempt is given up on rather than leased again
+        conn.execute(
+            "UPDATE shards SET status = 'failed', error = ?, lease_owner = NULL, lease_expires = NULL "
+            f"WHERE {where}status = 'leased' AND lease_expires < ? AND attempts >= ?",
+            (f'Lease expired on all {MAX_ATTEMPTS} attempts', *params, now, MAX_ATTEMPTS),
+        )
+        row = conn.execute(
+            "SELECT shard_id, path, subject_cols, max_marks FROM shards "
+            f"WHERE {where}(status = 'pending' OR (status = 'leased' AND lease_expires < ?)) "
+            "ORDER BY shard_id LIMIT 1",
+            (*params, now),
+        ).fetchone()
+        if row is not None:
+            conn.execute(
+                "UPDATE shards SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE shard_id = ?",
+                (owner, now + lease_seconds, row[0]),
+            )
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    if row is None:
+        return None
+    max_marks = int(row[3]) if float(row[3]).is_integer() else row[3]
+    return row[0], row[1], json.loads(row[2]), max_marks
+
+
+def _finish(conn, shard_id, owner, status, partial=None, error=None):
+    # Only the current lease holder may record a result; a worker whose lease
+    # expired and was taken over just drops its work (and gets None back)
+    cur = conn.execute(
+        "UPDATE shards SET status = ?, partial = ?, error = ?, lease_owner = NULL, lease_expires = NULL "
+        "WHERE shard_id = ? AND lease_owner = ? AND status = 'leased'",
+        (status, partial, error, shard_id, owner),
+    )
+    return status if cur.rowcount == 1 else None
+
+
+class _LeaseKeeper(threading.Thread):
+    """Extends a shard's lease while it is being scored"""
+
+    def __init__(self, db_path, shard_id, owner, lease_seconds):
+        super().__init__(daemon=True)
+        self.db_path, self.shard_id, self.owner, self.lease_seconds = db_path, shard_id, owner, lease_seconds
+        self.stopped = threading.Event()
+
+    def run(self):
+        with closing(connect(self.db_path)) as conn:
+            while not self.stopped.wait(self.lease_seconds / 3):
+                conn.execute(
+                    "UPDATE shards SET lease_expires = ? WHERE shard_id = ? AND lease_owner = ?",
+                    (time.time() + self.lease_seconds, self.shard_id, self.owner),
+                )
+
+
+def process_shard(db_path, conn, owner, shard, lease_seconds=LEASE_SECONDS, chunksize=CHUNK_SIZE):
+    """Score a leased shard; returns the status recorded for it, or None if the lease was lost"""
+    shard_id, path, subject_cols, max_marks = shard
+    keeper = _LeaseKeeper(db_path, shard_id, owner, lease_seconds)
+    keeper.start()
+    try:
+        tally = stream_score(path, subject_cols, max_marks, chunksize)
+    except (ValueError, OSError) as e:
+        # Bad data or a missing file will not fix itself on retry
+        return _finish(conn, shard_id, owner, 'failed', error=str(e))
+    except Exception as e:
+        attempts = conn.execute('SELECT attempts FROM shards WHERE shard_id = ?', (shard_id,)).fetchone()[0]
+        status = 'failed' if attempts >= MAX_ATTEMPTS else 'pending'
+        return _finish(conn, shard_id, owner, status, error=f'{type(e).__name__}: {e}')
+    finally:
+        keeper.stopped.set()
+        keeper.join()
+    return _finish(conn, shard_id, owner, 'done', partial=json.dumps(tally.to_dict()))
+
+
+def work(db_path, lease_seconds=LEASE_SECONDS, idle_exit=False, chunksize=CHUNK_SIZE, job=None):
+    """Score shards of ``job`` (default: every job) until none is left open (``idle_exit``) or forever.
+
+    Returns the number of shards completed.
+    """
+    owner = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+    done = 0
+    with closing(connect(db_path)) as conn:
+        while True:
+            shard = claim(conn, owner, lease_seconds, job)
+            if shard is None:
+                if idle_exit and not _has_open_shards(conn, job):
+                    return done
+                time.sleep(POLL_SECONDS)
+                continue
+            if process_shard(db_path, conn, owner, shard, lease_seconds, chunksize) == 'done':
+                done += 1
+
+
+def _has_open_shards(conn, job=None):
+    # Leased shards may still come back if their worker dies, so keep waiting for them
+    where, params = _job_filter(job)
+    return conn.execute(
+        f"SELECT 1 FROM shards WHERE {where}status IN ('pending', 'leased') LIMIT 1", params,
+    ).fetchone() is not None
+
+
+def run_local(db_path, workers, lease_seconds=LEASE_SECONDS, job=None):
+    """Score ``job`` with local worker processes until none of its shards is open"""
+    processes = [
+        Process(target=work, args=(db_path, lease_seconds, True), kwargs={'job': job}) for _ in range(workers)
+    ]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+
+
+# -------------------- CLI --------------------
+def _print_merge(db_path, job, output):
+    total, shards = merge(db_path, job)
+    status = job_status(db_path, job)
+    if output:
+        if output.lower().endswith('.xlsx'):
+            shards.to_excel(output, index=False)
+        else:
+            shards.to_csv(output, index=False)
+    print(f"Job {job}: {', '.join(f'{n} {s}' for s, n in sorted(status.items())) or 'no shards'}")
+    if total.total_students:
+        print(f'API Score: {total.api_score:.2f} over {total.total_students} students')
+        for label, count in total.division_distribution().items():
+            print(f'  {label:>9}: {count}')
+    if status.get('pending') or status.get('leased'):
+        print('Job incomplete: the result above covers finished shards only')
+        return 1
+    return 1 if status.get('failed') else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Score many class exports through a shared SQLite job queue.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def add_job_args(p, files=False):
+        p.add_argument('db', help='queue database')
+        p.add_argument('--job', required=True, help='job name, e.g. board-2026')
+        if files:
+            p.add_argument('files', nargs='+', help='CSV/XLSX exports, one shard each')
+            p.add_argument('--subjects', default='marks', help='comma-separated subject columns (default: marks)')
+            p.add_argument('--max-marks', type=float, default=100, help='maximum marks per subject')
+
+    add_job_args(sub.add_parser('submit', help='queue files as shards'), files=True)
+    p_work = sub.add_parser('work', help='score shards from the queue')
+    p_work.add_argument('db')
+    p_work.add_argument('--lease', type=float, default=LEASE_SECONDS, help='lease length in seconds')
+    p_work.add_argument('--idle-exit', action='store_true', help='exit once no shard is pending or leased')
+    add_job_args(sub.add_parser('status', help='shard counts per status'))
+    p_merge = sub.add_parser('merge', help='merge finished shards into the job result')
+    add_job_args(p_merge)
+    p_merge.add_argument('-o', '--output', help='per-shard summary file (.csv or .xlsx)')
+    p_run = sub.add_parser('run', help='submit, score with local workers and merge')
+    add_job_args(p_run, files=True)
+    p_run.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1)
+    p_run.add_argument('-o', '--output', help='per-shard summary file (.csv or .xlsx)')
+    args = parser.parse_args(argv)
+
+    if args.command in ('submit', 'run'):
+        subjects = [s.strip().lower() for s in args.subjects.split(',') if s.strip()]
+        added = submit(args.db, args.job, args.files, subjects, args.max_marks)
+        print(f'Queued {added} new shards for job {args.job}')
+    if args.command == 'work':
+        print(f'Completed {work(args.db, args.lease, args.idle_exit)} shards')
+    elif args.command == 'status':
+        print(json.dumps(job_status(args.db, args.job)))
+    elif args.command == 'merge':
+        return _print_merge(args.db, args.job, args.output)
+    elif args.command == 'run':
+        run_local(args.db, args.workers, job=args.job)
+        return _print_merge(args.db, args.job, args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
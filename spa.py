@@ -1,114 +1,132 @@
-import os
-import pandas as pd
-import streamlit as st
-import matplotlib.pyplot as plt
-from sklearn.cluster import KMeans
-import numpy as np
-
-BASE_FOLDER = "class_data"  # Main folder to store class-wise data
-
-# Function to create a folder for a class
-def create_class_folder(class_name):
-    """Create a folder for the class if it doesn't exist"""
-    class_folder = os.path.join(BASE_FOLDER, class_name)
-    if not os.path.exists(class_folder):
-        os.makedirs(class_folder)
-    return class_folder
-
-# Function to save test results per class
-def save_class_test_results(class_name, df):
-    """Save test results in a CSV file for the given class"""
-    class_folder = create_class_folder(class_name)
-    file_path = os.path.join(class_folder, "student_performance.csv")
-    
-    if os.path.exists(file_path):
-        old_data = pd.read_csv(file_path)
-        df = pd.concat([old_data, df])  # Append new test results
-    df.to_csv(file_path, index=False)
-
-# Function to load past student performance for a class
-def load_past_performance(class_name):
-    """Load stored test results for a class"""
-    class_folder = os.path.join(BASE_FOLDER, class_name)
-    file_path = os.path.join(class_folder, "student_performance.csv")
-    
-    if not os.path.exists(file_path):
-        return None
-    return pd.read_csv(file_path)
-
-# Function to analyze student performance using K-Means Clustering
-def analyze_class_performance(class_name):
-    """Analyze student performance and categorize them"""
-    df = load_past_performance(class_name)
-    
-    if df is None:
-        st.error(f"No data found for Class {class_name}. Please upload test data first.")
-        return
-    
-    # K-Means Clustering for performance categorization
-    num_clusters = 3  # High Achiever, Average, Needs Improvement
-    marks = df[['Marks']].values
-    
-    kmeans = KMeans(n_clusters=num_clusters, random_state=42, n_init=10)
-    df['Cluster'] = kmeans.fit_predict(marks)
-
-    # Assign meaningful labels to clusters
-    sorted_indices = np.argsort(kmeans.cluster_centers_.flatten())
-    cluster_mapping = {
-        sorted_indices[0]: "Needs Improvement",
-        sorted_indices[1]: "Average",
-        sorted_indices[2]: "High Achiever"
-    }
-    df['Category'] = df['Cluster'].map(cluster_mapping)
-
-    # Save updated data with categories
-    save_class_test_results(class_name, df)
-
-    # Display results
-    st.write(f"### Performance Analysis for Class {class_name}")
-    st.dataframe(df[['Name', 'Marks', 'Category']])
-
-    # Show student distribution in different categories
-    category_counts = df['Category'].value_counts()
-    st.bar_chart(category_counts)
-
-# Function to compare performance between multiple classes
-def compare_classes(class_list):
-    """Compare average performance of multiple classes"""
-    avg_marks = {}
-    
-    for class_name in class_list:
-        df = load_past_performance(class_name)
-        if df is not None:
-            avg_marks[class_name] = df["Marks"].mean()
-
-    if avg_marks:
-        st.write("### Class Performance Comparison")
-        st.bar_chart(avg_marks)
-    else:
-        st.error("No test data found for the selected classes.")
-
-# Streamlit App UI
-st.title("Multi-Class AI-Based Student Performance Analyzer")
-
-# Select a class for analysis
-class_name = st.text_input("Enter Class & Section (e.g., 10A, 9B)")
-
-# Upload new test results
-uploaded_file = st.file_uploader("Upload Excel file (with 'Name' and 'Marks' columns)", type=["xlsx"])
-if uploaded_file and class_name:
-    df = pd.read_excel(uploaded_file)
-    if {'Name', 'Marks'}.issubset(df.columns):
-        save_class_test_results(class_name, df)
-        st.success(f"Test results saved for Class {class_name}")
-    else:
-        st.error("Excel file must contain 'Name' and 'Marks' columns.")
-
-# Analyze performance for a specific class
-if st.button("Analyze Class Performance") and class_name:
-    analyze_class_performance(class_name)
-
-# Compare multiple classes
-class_list = st.text_area("Enter Class Names for Comparison (comma-separated, e.g., 10A, 9B)")
-if st.button("Compare Classes") and class_list:
-    compare_classes(class_list.split(","))
+import os
+
+import pandas as pd
+import streamlit as st
+
+import class_store
+import clustering
+import rollup
+from api_scoring import DIVISION_ORDER
+from ingestion import read_workbook
+from instrumentation import instrumented, stage
+
+BASE_FOLDER = "class_data"  # Main folder to store class-wise data
+DB_PATH = os.path.join(BASE_FOLDER, "student_performance.db")  # Results of every class
+
+# Function to bring an old per-class CSV into the store
+def migrate_legacy_results(class_name):
+    """Import the class's old student_performance.csv, if any"""
+    csv_path = os.path.join(BASE_FOLDER, class_name, "student_performance.csv")
+    class_store.import_legacy_csv(DB_PATH, class_name, csv_path)
+
+# Function to save test results per class
+def save_class_test_results(class_name, df, assessment="Assessment"):
+    """Save test results for the given class, replacing earlier marks for the same assessment"""
+    migrate_legacy_results(class_name)
+    class_store.append_results(DB_PATH, class_name, df, assessment)
+
+# Function to load a class's results, kept resident in memory between runs
+def load_class_results(class_name):
+    """Load stored test results for a class as compact ClassResults"""
+    migrate_legacy_results(class_name)
+    return class_store.load_class_results(DB_PATH, class_name)
+
+# Function to analyze student performance using K-Means Clustering
+@instrumented("analyze_class")
+def analyze_class_performance(class_name, refit=False, backend="exact"):
+    """Analyze student performance and categorize them"""
+    with stage("load") as s:
+        results = load_class_results(class_name)
+        s.rows = 0 if results is None else len(results)
+    
+    if results is None:
+        st.error(f"No data found for Class {class_name}. Please upload test data first.")
+        return
+    
+    with stage(f"cluster:{backend}", len(results)):
+        if backend == "exact":
+            # Exact 1-D clustering is deterministic and cheap enough for the full history
+            centers, _ = clustering.fit_exact(results)
+        else:
+            # K-Means centers are persisted, so later runs only fold in marks
+            # appended since the last run
+            state = None if refit else class_store.load_cluster_state(DB_PATH, class_name)
+            if state is None:
+                marks, last_rowid = class_store.load_marks_since(DB_PATH, class_name)
+                centers, counts = clustering.fit_kmeans(marks)
+            else:
+                centers, counts, last_rowid = state
+                new_marks, last_rowid = class_store.load_marks_since(DB_PATH, class_name, last_rowid)
+                centers, counts = clustering.update_centers(centers, counts, new_marks)
+            class_store.save_cluster_state(DB_PATH, class_name, centers, counts, last_rowid)
+
+    # Sorted centers map to Needs Improvement, Average, High Achiever
+    with stage("categorize", len(results)):
+        df = pd.DataFrame({'Name': results.names, 'Marks': results.percentages})
+        df['Category'] = clustering.assign_categories(df['Marks'], centers)
+
+    # Display results
+    st.write(f"### Performance Analysis for Class {class_name}")
+    with stage("render", len(df)):
+        st.dataframe(df[['Name', 'Marks', 'Category']])
+
+    # Show student distribution in different categories
+    category_counts = df['Category'].value_counts()
+    st.bar_chart(category_counts)
+
+# Function to compare performance between multiple classes
+def compare_classes(class_list):
+    """Compare average marks, API score and division distribution of multiple classes"""
+    class_list = list(dict.fromkeys(name.strip() for name in class_list if name.strip()))
+    for class_name in class_list:
+        migrate_legacy_results(class_name)
+
+    # Per-class summaries are kept up to date on every save, so this reads one
+    # small table instead of each class's full history
+    totals = class_store.load_summary_totals(DB_PATH, class_list)
+
+    if len(totals):
+        summary = rollup.finish(totals)
+        st.write("### Class Performance Comparison")
+        st.bar_chart(summary["Mean Marks"])
+        st.write("#### API Score")
+        st.bar_chart(summary["API Score"])
+        st.write("#### Division-wise Distribution")
+        st.bar_chart(summary[DIVISION_ORDER])
+        st.dataframe(summary[class_store.SUMMARY_COLUMNS])
+
+        # Sections merge into their grade (10A + 10B -> 10) by adding summaries
+        sections = totals.reset_index().rename(columns={"Class": "Section"})
+        sections.insert(0, "Grade", sections["Section"].str.extract(r"^(\d+)", expand=False).fillna(sections["Section"]))
+        grades = rollup.roll_up(sections, ["Grade", "Section"])["Grade"]
+        st.write("#### Grade-wise Roll-up")
+        st.dataframe(grades[class_store.SUMMARY_COLUMNS])
+    else:
+        st.error("No test data found for the selected classes.")
+
+# Streamlit App UI
+st.title("Multi-Class AI-Based Student Performance Analyzer")
+
+# Select a class for analysis
+class_name = st.text_input("Enter Class & Section (e.g., 10A, 9B)").strip()
+
+# Upload new test results
+uploaded_file = st.file_uploader("Upload Excel file (with 'Name' and 'Marks' columns)", type=["xlsx"])
+if uploaded_file and class_name:
+    df = read_workbook(uploaded_file, ['Name', 'Marks'])
+    if {'Name', 'Marks'}.issubset(df.columns):
+        save_class_test_results(class_name, df, uploaded_file.name)
+        st.success(f"Test results saved for Class {class_name}")
+    else:
+        st.error("Excel file must contain 'Name' and 'Marks' columns.")
+
+# Analyze performance for a specific class
+backend = st.selectbox("Clustering method", list(clustering.BACKENDS))
+refit = st.checkbox("Refit clusters from full history")
+if st.button("Analyze Class Performance") and class_name:
+    analyze_class_performance(class_name, refit, clustering.BACKENDS[backend])
+
+# Compare multiple classes
+class_list = st.text_area("Enter Class Names for Comparison (comma-separated, e.g., 10A, 9B)")
+if st.button("Compare Classes") and class_list:
+    compare_classes(class_list.split(","))
@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from api_scoring import ScoreTally, to_percentage
+
+# -------------------- STREAMING SCORING --------------------
+# Board-level exports do not fit in memory as one DataFrame. These helpers read
+# a sheet in fixed-size chunks and only keep running band/division counts.
+CHUNK_SIZE = 50_000
+
+
+def _header_key(col):
+    return str(col).strip().lower()
+
+
+def _check_range(marks, max_marks):
+    if np.any(marks > max_marks) or np.any(marks < 0):
+        raise ValueError(f'Marks must be between 0 and {max_marks}')
+
+
+def _iter_csv_chunks(path, columns, chunksize):
+    wanted = set(columns)
+    reader = pd.read_csv(path, usecols=lambda col: _header_key(col) in wanted, chunksize=chunksize)
+    for chunk in reader:
+        chunk.columns = [_header_key(col) for col in chunk.columns]
+        missing = wanted.difference(chunk.columns)
+        if missing:
+            raise ValueError(f"Sheet is missing columns: {', '.join(sorted(missing))}")
+        yield chunk[list(columns)].to_numpy(dtype=float)
+
+
+def _iter_xlsx_chunks(path, columns, chunksize):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [_header_key(col) for col in next(rows, ())]
+        missing = set(columns).difference(header)
+        if missing:
+            raise ValueError(f"Sheet is missing columns: {', '.join(sorted(missing))}")
+        positions = [header.index(col) for col in columns]
+
+        batch = []
+        blank_rows = 0
+        for row in rows:
+            if all(cell is None for cell in row):
+                # pandas keeps blank rows between records but drops trailing ones
+                blank_rows += 1
+                continue
+            batch.extend([[None] * len(positions)] * blank_rows)
+            blank_rows = 0
+            batch.append([row[i] if i < len(row) else None for i in positions])
+            if len(batch) >= chunksize:
+                yield np.array(batch, dtype=float)
+                batch = []
+        if batch:
+            yield np.array(batch, dtype=float)
+    finally:
+        wb.close()
+
+
+def iter_mark_chunks(path, columns, chunksize=CHUNK_SIZE):
+    """Yield 2-D float arrays of the given (normalized) columns, ``chunksize`` rows at a time"""
+    ext = os.path.splitext(str(path))[1].lower()
+    if ext == '.csv':
+        return _iter_csv_chunks(path, columns, chunksize)
+    if ext in ('.xlsx', '.xlsm'):
+        return _iter_xlsx_chunks(path, columns, chunksize)
+    raise ValueError(f'Unsupported file type: {ext}')
+
+
+def stream_score(path, subject_cols=('marks',), max_marks=100, chunksize=CHUNK_SIZE, tally=None):
+    """Score a CSV/XLSX export chunk by chunk with bounded memory.
+
+    A single ``marks`` column is used as the percentage directly; several
+    subject columns are totalled and divided by ``max_marks`` per subject,
+    matching the five-subject calculator. Returns a ScoreTally.
+    """
+    tally = tally if tally is not None else ScoreTally()
+    total_max = max_marks * len(subject_cols)
+    for marks in iter_mark_chunks(path, list(subject_cols), chunksize):
+        _check_range(marks, max_marks)
+        totals = marks[:, 0] if marks.shape[1] == 1 else np.nansum(marks, axis=1)
+        tally.update(to_percentage(totals, total_max))
+    return tally
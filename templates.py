@@ -0,0 +1,56 @@
+from functools import lru_cache
+from io import BytesIO
+
+import pandas as pd
+
+# -------------------- EXCEL TEMPLATES --------------------
+# Template workbooks never change, so each registered one is built once per
+# process and the bytes are reused on every Streamlit rerun. Custom subject
+# lists come from user input, so only the most recent of those are kept.
+SINGLE_SUBJECT_COLUMNS = ('Name', 'Marks')
+FIVE_SUBJECT_COLUMNS = ('Name', 'Subject1', 'Subject2', 'Subject3', 'Subject4', 'Subject5')
+SIX_SUBJECT_COLUMNS = ('Name', 'English', 'Hindi', 'Maths', 'Science', 'SST', 'Sanskrit')
+
+CUSTOM_CACHE_SIZE = 32
+
+# Template name -> header row
+TEMPLATES = {}
+_registered_bytes = {}
+
+
+def register_template(name, columns):
+    TEMPLATES[name] = tuple(columns)
+    _registered_bytes.pop(name, None)
+
+
+register_template('single_subject', SINGLE_SUBJECT_COLUMNS)
+register_template('five_subject', FIVE_SUBJECT_COLUMNS)
+register_template('six_subject', SIX_SUBJECT_COLUMNS)
+
+
+def build_template(columns):
+    """Blank .xlsx with the given headers and one empty row"""
+    template = pd.DataFrame({col: [''] for col in columns})
+    buf = BytesIO()
+    with pd.ExcelWriter(buf, engine='xlsxwriter') as writer:
+        template.to_excel(writer, index=False)
+    return buf.getvalue()
+
+
+@lru_cache(maxsize=CUSTOM_CACHE_SIZE)
+def template_bytes(columns):
+    return build_template(columns)
+
+
+def get_template(name):
+    """Cached workbook bytes of a registered template"""
+    data = _registered_bytes.get(name)
+    if data is None:
+        data = _registered_bytes[name] = build_template(TEMPLATES[name])
+    return data
+
+
+def subject_template(subjects):
+    """Cached workbook for a Name column followed by a custom list of subjects"""
+    subjects = tuple(s.strip() for s in subjects if s.strip())
+    return template_bytes(('Name',) + subjects)
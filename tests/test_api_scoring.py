@@ -0,0 +1,142 @@
+import json
+
+import numpy as np
+import pytest
+
+from api_scoring import (
+    BAND_LABELS, DIVISION_ORDER, ScoreTally, assign_bands, band_labels, calculate_api_from_percentage,
+    classify_percentages, division_codes, score_percentages,
+)
+
+# The row-by-row rules the apps used before scoring was vectorized
+LEGACY_CATEGORIES = {
+    '>95': (95, 100, 10), '90-94.99': (90, 94.99, 8), '80-89.99': (80, 89.99, 6), '70-79.99': (70, 79.99, 4),
+    '60-69.99': (60, 69.99, 2), '50-59.99': (50, 59.99, 0), '33-49.99': (33, 49.99, -1), '<33': (0, 32.99, -3),
+}
+
+
+def legacy_score(percentages):
+    category_counts = {key: 0 for key in LEGACY_CATEGORIES}
+    for mark in percentages:
+        for category, (low, high, weight) in LEGACY_CATEGORIES.items():
+            if low <= mark <= high:
+                category_counts[category] += 1
+                break
+    total_weighted_score = sum(category_counts[cat] * weight for cat, (_, _, weight) in LEGACY_CATEGORIES.items())
+    return (total_weighted_score / len(percentages)) * 100, category_counts
+
+
+def legacy_band(mark):
+    for category, (low, high, _) in LEGACY_CATEGORIES.items():
+        if low <= mark <= high:
+            return category
+    return None
+
+
+def legacy_division(pct):
+    for low, label in [(95, '>95'), (90, '90-94.99'), (80, '80-89.99'), (70, '70-79.99'),
+                       (60, '60-69.99'), (50, '50-59.99'), (33, '33-49.99')]:
+        if pct >= low:
+            return label
+    return '<33'
+
+
+def legacy_performance(pct):
+    if pct >= 95: return 'High Achiever'
+    elif pct >= 75: return 'Average'
+    elif pct >= 50: return 'Needs Improvement'
+    elif pct >= 33: return 'Remedial'
+    else: return 'Critical'
+
+
+def legacy_feedback(mark):
+    if mark >= 90: return 'Excellent performance'
+    elif mark >= 75: return 'Good performance, keep improving'
+    elif mark >= 60: return 'Needs some improvement'
+    elif mark >= 33: return 'Needs significant improvement'
+    else: return 'At risk, requires immediate attention'
+
+
+# Band edges, the gaps between bands (94.995, 32.995), NaN and out-of-range values
+EDGE_CASES = [
+    0, 0.001, 32.99, 32.995, 33, 49.99, 49.995, 50, 59.99, 59.999, 60, 69.99, 70, 74.999, 75, 79.99, 80,
+    89.99, 89.995, 90, 94.99, 94.995, 95, 99.99, 100, 100.001, 120, -0.5, -10, np.nan,
+]
+
+
+@pytest.fixture(params=['edges', 'random'])
+def percentages(request):
+    if request.param == 'edges':
+        return np.array(EDGE_CASES, dtype=float)
+    rng = np.random.default_rng(0)
+    decimals = rng.integers(0, 4, size=5000)
+    pct = np.round(rng.uniform(-5, 105, size=5000) * 10.0 ** decimals) / 10.0 ** decimals
+    pct[rng.random(5000) < 0.02] = np.nan
+    return pct
+
+
+def test_score_matches_legacy_loop(percentages):
+    expected_score, expected_counts = legacy_score(percentages)
+    result = score_percentages(percentages)
+    assert result.api_score == pytest.approx(expected_score)
+    assert result.band_counts == expected_counts
+    assert result.total_students == len(percentages)
+    assert calculate_api_from_percentage(percentages) == pytest.approx(expected_score)
+
+
+def test_bands_match_legacy_loop(percentages):
+    assert band_labels(assign_bands(percentages)).tolist() == [legacy_band(p) for p in percentages]
+
+
+def test_classification_matches_legacy_rules(percentages):
+    result = classify_percentages(percentages)
+    assert list(result.division) == [legacy_division(p) for p in percentages]
+    assert list(result.performance) == [legacy_performance(p) for p in percentages]
+    assert list(result.feedback) == [legacy_feedback(p) for p in percentages]
+    weights = {label: weight for label, (_, _, weight) in LEGACY_CATEGORIES.items()}
+    assert result.api_weight.tolist() == [weights.get(legacy_band(p), 0) for p in percentages]
+    assert [DIVISION_ORDER[c] for c in division_codes(percentages)] == list(result.division)
+
+
+def test_gap_values_count_as_students_without_weight():
+    result = score_percentages([94.995, 100])
+    assert result.total_students == 2
+    assert result.api_score == pytest.approx(500.0)
+    assert sum(result.band_counts.values()) == 1
+
+
+def test_empty_class():
+    result = score_percentages([])
+    assert result.api_score is None
+    assert result.band_counts == dict.fromkeys(BAND_LABELS, 0)
+
+
+def test_tally_chunks_and_merges_like_one_pass(percentages):
+    whole = ScoreTally().update(percentages)
+    chunked = ScoreTally()
+    for chunk in np.array_split(percentages, 7):
+        chunked.update(chunk)
+    halves = ScoreTally().update(percentages[:10]).merge(ScoreTally().update(percentages[10:]))
+
+    expected = score_percentages(percentages)
+    for tally in (whole, chunked, halves):
+        assert tally.total_students == expected.total_students
+        assert tally.api_score == pytest.approx(expected.api_score)
+        assert tally.band_counts.tolist() == list(expected.band_counts.values())
+        assert tally.marked == np.count_nonzero(~np.isnan(percentages))
+        assert tally.percentage_sum == pytest.approx(np.nansum(percentages))
+        assert tally.division_distribution() == {
+            label: [legacy_division(p) for p in percentages].count(label) for label in DIVISION_ORDER
+        }
+
+
+def test_tally_round_trips_through_json(percentages):
+    tally = ScoreTally().update(percentages)
+    restored = ScoreTally.from_dict(json.loads(json.dumps(tally.to_dict())))
+    assert restored.to_dict() == tally.to_dict()
+    assert restored.api_score == tally.api_score
+
+
+def test_empty_tally_has_no_score():
+    assert ScoreTally().api_score is None
+    assert ScoreTally().merge(ScoreTally()).total_students == 0
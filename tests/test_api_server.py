@@ -0,0 +1,121 @@
+import asyncio
+import http.client
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api_server import ScoringServer
+
+CLASS_A = {'class': 'A', 'students': [{'Name': 'a', 'Marks': 96}, {'Name': 'b', 'Marks': 40}]}
+
+
+@pytest.fixture(scope='module')
+def port():
+    loop = asyncio.new_event_loop()
+    app = ScoringServer(workers=4, threads=True)
+    server = loop.run_until_complete(app.start('127.0.0.1', 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield server.sockets[0].getsockname()[1]
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    server.close()
+    loop.run_until_complete(server.wait_closed())
+    loop.close()
+    app.close()
+
+
+def request(port, method, path, payload=None):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    if isinstance(payload, str):
+        body, content_type = payload, 'text/csv'
+    else:
+        body, content_type = (None if payload is None else json.dumps(payload)), 'application/json'
+    conn.request(method, path, body, {'Content-Type': content_type})
+    response = conn.getresponse()
+    result = response.status, json.loads(response.read())
+    conn.close()
+    return result
+
+
+def raw_request(port, data):
+    with socket.create_connection(('127.0.0.1', port), timeout=30) as sock:
+        sock.sendall(data)
+        return sock.makefile('rb').readline()
+
+
+def test_health(port):
+    assert request(port, 'GET', '/health') == (200, {'status': 'ok'})
+
+
+def test_score_single_class(port):
+    status, payload = request(port, 'POST', '/score', CLASS_A)
+    assert status == 200
+    assert payload['total_students'] == 2
+    assert payload['api_score'] == pytest.approx((10 - 1) / 2 * 100)
+
+
+def test_batch_reports_bad_class_on_its_own(port):
+    status, payload = request(port, 'POST', '/batch', {'classes': [
+        CLASS_A,
+        {'class': 'empty', 'students': []},
+        {'class': 'not objects', 'students': [1, 2]},
+    ]})
+    assert status == 200
+    results = {entry['class']: entry for entry in payload['classes']}
+    assert results['A']['api_score'] == pytest.approx(450.0)
+    assert 'error' in results['empty']
+    assert 'error' in results['not objects']
+
+
+def test_marks_sent_as_strings(port):
+    students = [{'Name': 'a', 'Marks': '96'}, {'Name': 'b', 'Marks': '40'}, {'Name': 'c', 'Marks': ''}]
+    status, payload = request(port, 'POST', '/score', {'class': 'A', 'students': students})
+    assert status == 200
+    assert payload['total_students'] == 3
+    assert payload['api_score'] == pytest.approx((10 - 1) / 3 * 100)
+
+    students[2]['Marks'] = 'absent'
+    status, payload = request(port, 'POST', '/score', {'class': 'A', 'students': students})
+    assert status == 400
+    assert 'must be numeric' in payload['error']
+
+
+def test_score_csv(port):
+    status, payload = request(port, 'POST', '/score?rows=1', 'Name,Marks\na,96\nb,40\n')
+    assert status == 200
+    assert payload['api_score'] == pytest.approx(450.0)
+    assert [row['division'] for row in payload['students']] == ['>95', '33-49.99']
+
+
+def test_batch_csv_reports_rows_without_class(port):
+    status, payload = request(port, 'POST', '/batch', 'Class,Name,Marks\nA,a,96\n,b,40\nB,c,50\n')
+    assert status == 200
+    results = payload['classes']
+    assert [entry['class'] for entry in results] == ['A', None, 'B']
+    assert results[0]['total_students'] == 1
+    assert results[1]['error'] == 'Rows without a Class: 1'
+    assert results[2]['api_score'] == pytest.approx(0.0)
+
+
+def test_batch_csv_needs_class_column(port):
+    assert request(port, 'POST', '/batch', 'Name,Marks\na,96\n')[0] == 400
+
+
+@pytest.mark.parametrize('length', [b'abc', b'-5'])
+def test_invalid_content_length_is_rejected(port, length):
+    status_line = raw_request(port, b'POST /score HTTP/1.1\r\nContent-Length: ' + length + b'\r\n\r\n')
+    assert status_line.split()[1] == b'400'
+
+
+def test_unknown_route(port):
+    assert request(port, 'GET', '/nope')[0] == 404
+
+
+def test_many_concurrent_requests(port):
+    with ThreadPoolExecutor(32) as pool:
+        results = list(pool.map(lambda _: request(port, 'POST', '/score', CLASS_A), range(200)))
+    assert all(status == 200 and payload['api_score'] == pytest.approx(450.0) for status, payload in results)
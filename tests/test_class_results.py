@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from api_scoring import classify_percentages, score_percentages
+from class_results import ClassResults, StudentRecord
+
+
+@pytest.fixture(params=['hundredths', 'fine', 'missing'])
+def marks(request):
+    rng = np.random.default_rng(0)
+    pct = rng.uniform(0, 100, size=1000).round(2)
+    pct[:4] = [94.99, 95, 32.99, 100]
+    if request.param == 'fine':
+        pct[4] = 94.995
+    if request.param == 'missing':
+        pct[4] = np.nan
+    names = [f'Student {i % 300}' for i in range(len(pct))]
+    return names, pct
+
+
+def test_round_trip(marks):
+    names, pct = marks
+    results = ClassResults(names, pct)
+    frame = results.to_frame()
+    assert frame['name'].tolist() == names
+    np.testing.assert_array_equal(frame['percentage'].to_numpy(), pct)
+    expected = classify_percentages(pct)
+    assert list(frame['division']) == list(expected.division)
+    assert list(frame['performance category']) == list(expected.performance)
+
+
+def test_scoring_accepts_results_directly(marks):
+    names, pct = marks
+    results = ClassResults(names, pct)
+    direct = score_percentages(pct)
+    compact = score_percentages(results)
+    assert compact.api_score == direct.api_score
+    assert compact.band_counts == direct.band_counts
+    np.testing.assert_array_equal(classify_percentages(results).api_weight, classify_percentages(pct).api_weight)
+
+
+def test_exact_hundredths_are_stored_compactly():
+    results = ClassResults(['a', 'b'], [94.99, 40])
+    assert results.scale == 100 and results.marks.dtype == np.int16
+    assert ClassResults(['a'], [94.995]).scale == 1
+
+
+def test_records_and_slices(marks):
+    names, pct = marks
+    results = ClassResults(names, pct)
+    record = results[-1]
+    assert isinstance(record, StudentRecord)
+    assert record.name == names[-1]
+    assert record.percentage == pct[-1]
+    assert [r.name for r in results[2:6]] == names[2:6]
+    assert [r.percentage for r in results[::-250]] == pct[::-250].tolist()
+    assert len(list(results)) == len(results)
+
+
+def test_arrays_handed_out_do_not_change_the_container(marks):
+    names, pct = marks
+    source = pct.copy()
+    results = ClassResults(names, source)
+    source[:] = 0
+    np.testing.assert_array_equal(results.percentages, pct)
+
+    copied = np.array(results, copy=True)
+    copied[:] = 0
+    np.testing.assert_array_equal(results.percentages, pct)
+
+    view = np.asarray(results)
+    if view.flags.writeable:
+        view[:] = 0
+    else:
+        with pytest.raises(ValueError):
+            view[0] = 0
+    np.testing.assert_array_equal(results.percentages, pct)
+    assert np.asarray(results, dtype=np.float32).dtype == np.float32
+
+
+def test_copy_false_is_refused_when_a_conversion_is_needed():
+    results = ClassResults(['a'], [50.5])
+    with pytest.raises(ValueError):
+        np.asarray(results, copy=False)
+
+
+def test_uses_less_memory_than_a_frame(marks):
+    names, pct = marks
+    results = ClassResults(names, pct)
+    frame = pd.DataFrame({'name': pd.Series(names, dtype=object), 'percentage': pct})
+    bands = classify_percentages(pct)
+    frame['division'] = np.asarray(bands.division, dtype=object)
+    frame['performance category'] = np.asarray(bands.performance, dtype=object)
+    assert results.nbytes * 3 < frame.memory_usage(deep=True).sum()
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+import class_store
+import clustering
+
+
+def upload(db, marks, assessment, class_name='10A'):
+    df = pd.DataFrame({'Name': [f's{i}' for i in range(len(marks))], 'Marks': marks})
+    class_store.append_results(db, class_name, df, assessment)
+
+
+def incremental_centers(db, class_name='10A'):
+    # The K-Means path of spa.analyze_class_performance
+    state = class_store.load_cluster_state(db, class_name)
+    if state is None:
+        marks, last_rowid = class_store.load_marks_since(db, class_name)
+        centers, counts = clustering.fit_kmeans(marks)
+    else:
+        centers, counts, last_rowid = state
+        new_marks, last_rowid = class_store.load_marks_since(db, class_name, last_rowid)
+        centers, counts = clustering.update_centers(centers, counts, new_marks)
+    class_store.save_cluster_state(db, class_name, centers, counts, last_rowid)
+    return centers
+
+
+def test_reuploaded_assessment_resets_saved_centers(tmp_path):
+    db = str(tmp_path / 'results.db')
+    upload(db, [10, 11, 12, 50, 51, 52, 90, 91, 92], 'Unit 1')
+    assert np.allclose(incremental_centers(db), [11, 51, 91])
+
+    upload(db, [60, 61, 62, 70, 71, 72, 80, 81, 82], 'Unit 1')
+    assert class_store.load_cluster_state(db, '10A') is None
+    assert np.allclose(incremental_centers(db), [61, 71, 81])
+
+
+def test_new_assessment_keeps_saved_centers(tmp_path):
+    db = str(tmp_path / 'results.db')
+    upload(db, [10, 11, 12, 50, 51, 52, 90, 91, 92], 'Unit 1')
+    incremental_centers(db)
+    upload(db, [11, 51, 91], 'Unit 2')
+    assert class_store.load_cluster_state(db, '10A') is not None
+    assert len(class_store.load_results(db, '10A')) == 12
+
+
+def test_legacy_import_drops_analyze_write_back(tmp_path):
+    db = str(tmp_path / 'results.db')
+    csv_path = tmp_path / 'student_performance.csv'
+    upload_1 = pd.DataFrame({'Name': ['a', 'b', 'c'], 'Marks': [40, 60, 80]})
+    upload_2 = pd.DataFrame({'Name': ['a', 'b', 'c'], 'Marks': [45, 65, 85]})
+    # What the old app left behind: upload, Analyze (appends a labelled copy
+    # of everything), a second upload, then Analyze again
+    labelled = upload_1.assign(Cluster=[0, 1, 2], Category=['Needs Improvement', 'Average', 'High Achiever'])
+    history = pd.concat([upload_1, labelled])
+    history = pd.concat([history, upload_2])
+    history = pd.concat([history, history.assign(Cluster=0, Category='Average')])
+    history.to_csv(csv_path, index=False)
+
+    class_store.import_legacy_csv(db, '10A', str(csv_path))
+    stored = class_store.load_results(db, '10A', ('Name', 'Assessment', 'Marks'))
+    assert len(stored) == 6
+    assert stored.set_index(['Name', 'Assessment'])['Marks'].to_dict() == {
+        ('a', 'legacy-1'): 40, ('b', 'legacy-1'): 60, ('c', 'legacy-1'): 80,
+        ('a', 'legacy-2'): 45, ('b', 'legacy-2'): 65, ('c', 'legacy-2'): 85,
+    }
+    assert class_store.load_summaries(db, ['10A'])['Total Students'].tolist() == [6]
+    assert (tmp_path / 'student_performance.csv.imported').exists()
+
+
+def test_resident_class_results_follow_saves(tmp_path):
+    db = str(tmp_path / 'results.db')
+    assert class_store.load_class_results(db, '10A') is None
+    upload(db, [40, 60, 80], 'Unit 1')
+    first = class_store.load_class_results(db, '10A')
+    assert class_store.load_class_results(db, '10A') is first
+    assert first.percentages.tolist() == [40, 60, 80]
+
+    upload(db, [45, 60, 80], 'Unit 1')
+    second = class_store.load_class_results(db, '10A')
+    assert second is not first
+    assert second.percentages.tolist() == [45, 60, 80]
+    assert [r.name for r in second] == ['s0', 's1', 's2']
@@ -0,0 +1,35 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from clustering import fit_exact
+
+
+def brute_force_cost(values, k):
+    values = np.sort(values)
+    best = np.inf
+    for cuts in combinations(range(1, len(values)), k - 1):
+        groups = np.split(values, cuts)
+        best = min(best, sum(((g - g.mean()) ** 2).sum() for g in groups))
+    return best
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_fit_exact_is_optimal(seed):
+    rng = np.random.default_rng(seed)
+    marks = rng.integers(0, 100, size=rng.integers(3, 12)).astype(float)
+    k = min(3, len(np.unique(marks)))
+    centers, counts = fit_exact(marks, k)
+
+    labels = np.argmin(np.abs(marks[:, None] - centers[None, :]), axis=1)
+    cost = ((marks - centers[labels]) ** 2).sum()
+    assert counts.sum() == len(marks)
+    assert np.all(np.diff(centers) > 0)
+    assert cost == pytest.approx(brute_force_cost(marks, k))
+
+
+def test_fit_exact_ignores_missing_marks():
+    centers, counts = fit_exact([np.nan, 10, 10, 50, 90, np.nan])
+    assert centers.tolist() == [10, 50, 90]
+    assert counts.tolist() == [2, 1, 1]
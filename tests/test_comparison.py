@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from comparison import AssessmentAggregator, iter_assessment_files
+
+
+@pytest.fixture
+def assessments(tmp_path):
+    rng = np.random.default_rng(0)
+    frames, paths = [], []
+    for i in range(6):
+        names = [f's{n}' for n in rng.integers(0, 8, size=12)]  # repeated names within a file
+        marks = rng.integers(0, 101, size=12).astype(float)
+        marks[rng.random(12) < 0.2] = np.nan
+        df = pd.DataFrame({'Name': names, 'Marks': marks})
+        path = tmp_path / f'assessment{i}.xlsx'
+        df.to_excel(path, index=False)
+        frames.append(df)
+        paths.append(str(path))
+    return frames, paths
+
+
+def test_aggregator_matches_concat_mean(assessments):
+    frames, paths = assessments
+    aggregator = AssessmentAggregator()
+    for i, _, df, error in iter_assessment_files(paths, workers=2):
+        assert error is None
+        aggregator.add(df, t=i)
+    result = aggregator.summary(spread=True).set_index('Name')
+
+    combined = pd.concat(frames)
+    expected = combined.groupby('Name')['Marks']
+    pd.testing.assert_series_equal(result['Marks'], expected.mean(), check_names=False)
+    pd.testing.assert_series_equal(result['Std Dev'], expected.std(ddof=0), check_names=False)
+
+
+def test_bad_files_are_reported_in_order(assessments, tmp_path):
+    _, paths = assessments
+    broken = tmp_path / 'broken.xlsx'
+    broken.write_bytes(b'not a workbook')
+    files = paths[:2] + [str(broken)] + paths[2:]
+    results = list(iter_assessment_files(files, workers=2))
+    assert [i for i, *_ in results] == list(range(len(files)))
+    assert results[2][2] is None and results[2][3]
+    assert all(error is None for _, _, _, error in results[:2] + results[3:])
+
+
+def test_reads_ahead_at_most_two_per_worker(assessments):
+    _, paths = assessments
+    pulled = []
+
+    def files():
+        for path in paths:
+            pulled.append(path)
+            yield path
+
+    reader = iter_assessment_files(files(), workers=1)
+    next(reader)
+    assert len(pulled) == 2
+    reader.close()
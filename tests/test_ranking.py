@@ -0,0 +1,48 @@
+import pandas as pd
+
+from ranking import CohortRanking, RankIndex, dense_rank
+
+
+def test_dense_rank_ties_share_a_rank():
+    assert dense_rank([70, 90, 70, 80]).tolist() == [3, 1, 3, 2]
+
+
+def test_from_scores_matches_updates():
+    built = RankIndex.from_scores(['a', 'b', 'c', 'd'], [90, 70, 90, float('nan')])
+    updated = RankIndex()
+    for student, pct in [('a', 90), ('b', 70), ('c', 90)]:
+        updated.update(student, pct)
+    assert built.top(5) == updated.top(5)
+    assert 'd' not in built
+    assert built.rank('b') == 2
+
+
+def test_from_scores_duplicate_student_keeps_last_percentage():
+    index = RankIndex.from_scores(['a', 'a', 'b'], [90, 80, 70])
+    assert len(index) == 2
+    assert index.score('a') == 80
+
+    index.remove('a')
+    assert 'a' not in [student for student, *_ in index.top(5)]
+    assert index.rank('b') == 1
+
+
+def test_update_and_remove_keep_ranks_dense():
+    index = RankIndex.from_scores(['a', 'b', 'c'], [90, 80, 70])
+    index.update('c', 95)
+    assert index.rank('c') == 1
+    assert index.rank('b') == 3
+    index.remove('a')
+    assert index.rank('b') == 2
+
+
+def test_cohort_ranking_from_frame_with_repeated_names():
+    df = pd.DataFrame({
+        'grade': ['9', '9', '9', '10'],
+        'name': ['a', 'a', 'b', 'a'],
+        'pct': [90, 60, 70, 50],
+    })
+    ranking = CohortRanking.from_frame(df, 'grade', 'name', 'pct')
+    assert ranking.rank('9', 'b') == 1
+    assert ranking.rank('9', 'a') == 2
+    assert ranking.rank('10', 'a') == 1
@@ -0,0 +1,83 @@
+import os
+import time
+
+import pandas as pd
+
+import result_cache
+
+
+def entry_path(cache_dir, name):
+    return os.path.join(cache_dir, name)
+
+
+def test_frame_and_bytes_round_trip(tmp_path):
+    df = pd.DataFrame({'name': ['a', 'b'], 'percentage': [91.5, 40.0]})
+    key = result_cache.cache_key('abc123', 'single')
+    assert result_cache.get_frame(key, tmp_path) is None
+
+    result_cache.put_frame(key, df, tmp_path)
+    result_cache.put_bytes(key, 'CSV', b'name,percentage\n', tmp_path)
+    pd.testing.assert_frame_equal(result_cache.get_frame(key, tmp_path), df)
+    assert result_cache.get_bytes(key, 'CSV', tmp_path) == b'name,percentage\n'
+    assert result_cache.get_bytes(key, 'Excel', tmp_path) is None
+
+
+def test_keys_differ_by_mode_and_scheme():
+    keys = {
+        result_cache.cache_key('abc', 'single'),
+        result_cache.cache_key('abc', 'five'),
+        result_cache.cache_key('abc', 'single', scheme='other'),
+    }
+    assert len(keys) == 3
+
+
+def test_corrupt_pickle_is_a_miss(tmp_path):
+    key = result_cache.cache_key('abc', 'single')
+    with open(entry_path(tmp_path, f'{key}.frame.pkl'), 'wb') as fh:
+        fh.write(b'not a pickle')
+    assert result_cache.get_frame(key, tmp_path) is None
+
+
+def test_eviction_removes_least_recently_used_first(tmp_path):
+    now = time.time()
+    for i, name in enumerate(['old', 'middle', 'new']):
+        result_cache.put_bytes(name, 'CSV', b'x' * 100, tmp_path)
+        os.utime(entry_path(tmp_path, f'{name}.csv.bin'), (now - 100 + i, now - 100 + i))
+
+    # A hit refreshes the entry, so 'old' is now the most recently used
+    assert result_cache.get_bytes('old', 'CSV', tmp_path) is not None
+    result_cache.evict(max_bytes=200, cache_dir=tmp_path)
+    assert sorted(os.listdir(tmp_path)) == ['new.csv.bin', 'old.csv.bin']
+
+    result_cache.evict(max_bytes=0, cache_dir=tmp_path)
+    assert os.listdir(tmp_path) == []
+
+
+def test_writes_keep_the_directory_under_the_bound(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, 'CACHE_MAX_BYTES', 1000)
+    for i in range(30):
+        result_cache.put_bytes(f'key{i}', 'CSV', b'x' * 100, tmp_path)
+    sizes = [os.path.getsize(entry_path(tmp_path, name)) for name in os.listdir(tmp_path)]
+    assert sum(sizes) <= 1000
+    assert result_cache.get_bytes('key29', 'CSV', tmp_path) is not None
+
+
+def test_stale_temp_files_are_cleaned_up(tmp_path):
+    stale = entry_path(tmp_path, '.tmp-stale')
+    fresh = entry_path(tmp_path, '.tmp-fresh')
+    for path in (stale, fresh):
+        with open(path, 'wb') as fh:
+            fh.write(b'partial')
+    old = time.time() - 2 * 3600
+    os.utime(stale, (old, old))
+
+    result_cache.evict(cache_dir=tmp_path)
+    # A fresh temp file may belong to a writer that is still running
+    assert not os.path.exists(stale)
+    assert os.path.exists(fresh)
+
+
+def test_clear(tmp_path):
+    result_cache.put_bytes('key', 'CSV', b'data', tmp_path)
+    result_cache.clear(tmp_path)
+    assert os.listdir(tmp_path) == []
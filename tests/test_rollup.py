@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import class_store
+from api_scoring import DIVISION_ORDER, ScoreTally, division_codes, score_percentages
+from rollup import LEVELS, TOTAL_COLUMNS, roll_up, summary_frame, tally_totals
+
+
+@pytest.fixture
+def students():
+    rng = np.random.default_rng(0)
+    n = 3000
+    df = pd.DataFrame({
+        'District': rng.choice(['North', 'South'], n),
+        'School': rng.choice(['S1', 'S2', 'S3'], n),
+        'Grade': rng.choice(['9', '10'], n),
+        'Section': rng.choice(['A', 'B', 'C'], n),
+        'percentage': rng.uniform(0, 100, n).round(2),
+    })
+    df.loc[rng.random(n) < 0.03, 'percentage'] = np.nan
+    df.loc[:5, 'percentage'] = [94.995, 32.995, 95, 33, 100, 0]
+    return df
+
+
+def section_summaries(students):
+    return summary_frame(
+        (path, ScoreTally().update(group['percentage']))
+        for path, group in students.groupby(LEVELS, sort=False)
+    )
+
+
+def test_every_level_matches_scoring_its_rows(students):
+    result = roll_up(section_summaries(students))
+    assert set(result) == set(LEVELS) | {'All'}
+
+    for depth, level in enumerate(LEVELS, start=1):
+        keys = LEVELS[:depth]
+        for path, group in students.groupby(keys):
+            row = result[level].loc[path if depth > 1 else path[0]]
+            pct = group['percentage'].to_numpy()
+            assert row['Total Students'] == len(pct)
+            assert row['API Score'] == pytest.approx(score_percentages(pct).api_score)
+            assert row['Mean Marks'] == pytest.approx(np.nanmean(pct))
+            counts = np.bincount(division_codes(pct), minlength=len(DIVISION_ORDER))
+            assert row[DIVISION_ORDER].tolist() == counts.tolist()
+
+    total = result['All'].iloc[0]
+    assert total['API Score'] == pytest.approx(score_percentages(students['percentage']).api_score)
+    assert total['Total Students'] == len(students)
+
+
+def test_tally_totals_match_the_class_store_summary(students, tmp_path):
+    db = str(tmp_path / 'results.db')
+    section = students[(students['District'] == 'North') & (students['Section'] == 'A')]
+    marks = pd.DataFrame({'Name': [f's{i}' for i in range(len(section))], 'Marks': section['percentage'].values})
+    class_store.append_results(db, '10A', marks, 'Unit 1')
+
+    stored = class_store.load_summary_totals(db, ['10A']).loc['10A']
+    expected = tally_totals(ScoreTally().update(section['percentage']))
+    assert stored[TOTAL_COLUMNS].tolist() == pytest.approx([expected[col] for col in TOTAL_COLUMNS])
+
+
+def test_empty_summaries():
+    result = roll_up(summary_frame([]))
+    assert len(result['Section']) == 0
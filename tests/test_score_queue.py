@@ -0,0 +1,106 @@
+import sqlite3
+import time
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import score_queue
+from api_scoring import calculate_api_from_percentage
+
+
+@pytest.fixture
+def shards(tmp_path):
+    rng = np.random.default_rng(0)
+    paths, marks = [], []
+    for i in range(3):
+        values = rng.integers(0, 101, size=200)
+        path = tmp_path / f'class{i}.csv'
+        pd.DataFrame({'Name': [f's{i}-{n}' for n in range(len(values))], 'Marks': values}).to_csv(path, index=False)
+        paths.append(str(path))
+        marks.append(values)
+    db = str(tmp_path / 'queue.db')
+    score_queue.submit(db, 'job', paths)
+    return db, np.concatenate(marks)
+
+
+def _expire_leases(db):
+    with closing(sqlite3.connect(db, isolation_level=None)) as conn:
+        conn.execute("UPDATE shards SET lease_expires = ? WHERE status = 'leased'", (time.time() - 1,))
+
+
+def test_merged_score_matches_direct_score(shards):
+    db, marks = shards
+    assert score_queue.work(db, idle_exit=True) == 3
+    total, frame = score_queue.merge(db, 'job')
+    assert total.total_students == len(marks)
+    assert total.api_score == pytest.approx(calculate_api_from_percentage(marks.astype(float)))
+    assert frame['Status'].tolist() == ['done'] * 3
+
+
+def test_expired_lease_is_taken_over_and_late_result_rejected(shards):
+    db, _ = shards
+    with closing(score_queue.connect(db)) as conn:
+        dead = score_queue.claim(conn, 'dead-worker')
+        _expire_leases(db)
+        taken = score_queue.claim(conn, 'live-worker')
+        assert taken[0] == dead[0]
+
+        assert score_queue.process_shard(db, conn, 'dead-worker', dead) is None
+        assert score_queue.process_shard(db, conn, 'live-worker', taken) == 'done'
+        attempts = conn.execute('SELECT attempts FROM shards WHERE shard_id = ?', (dead[0],)).fetchone()[0]
+    assert attempts == 2
+
+
+def test_done_shards_are_never_rescored(shards):
+    db, _ = shards
+    assert score_queue.work(db, idle_exit=True) == 3
+    assert score_queue.work(db, idle_exit=True) == 0
+    with closing(score_queue.connect(db)) as conn:
+        assert score_queue.claim(conn, 'late-worker') is None
+        assert conn.execute('SELECT MAX(attempts) FROM shards').fetchone()[0] == 1
+
+
+def test_shard_fails_once_every_lease_expired(shards, monkeypatch):
+    db, _ = shards
+    monkeypatch.setattr(score_queue, 'MAX_ATTEMPTS', 2)
+    with closing(score_queue.connect(db)) as conn:
+        first = score_queue.claim(conn, 'w1')
+        for _ in range(2):
+            _expire_leases(db)
+            shard = score_queue.claim(conn, 'w2')
+            assert shard is not None
+        status = dict(conn.execute('SELECT shard_id, status FROM shards').fetchall())
+    assert status[first[0]] == 'failed'
+
+
+def test_work_counts_only_done_shards(tmp_path):
+    path = tmp_path / 'bad.csv'
+    pd.DataFrame({'Name': ['a'], 'Marks': [250]}).to_csv(path, index=False)
+    db = str(tmp_path / 'queue.db')
+    score_queue.submit(db, 'job', [str(path)])
+    assert score_queue.work(db, idle_exit=True) == 0
+    assert score_queue.job_status(db, 'job') == {'failed': 1}
+
+
+def test_merge_reports_incomplete_job(shards, capsys):
+    db, _ = shards
+    assert score_queue.main(['merge', db, '--job', 'job']) == 1
+    assert 'incomplete' in capsys.readouterr().out
+    score_queue.work(db, idle_exit=True)
+    assert score_queue.main(['merge', db, '--job', 'job']) == 0
+
+
+def test_work_for_one_job_leaves_other_jobs_alone(shards, tmp_path):
+    db, _ = shards
+    path = tmp_path / 'other.csv'
+    pd.DataFrame({'Name': ['a'], 'Marks': [50]}).to_csv(path, index=False)
+    score_queue.submit(db, 'other', [str(path)])
+    with closing(score_queue.connect(db)) as conn:
+        # A lease held elsewhere on job 'job' must not keep 'other' waiting
+        score_queue.claim(conn, 'busy-worker', job='job')
+
+    assert score_queue.work(db, idle_exit=True, job='other') == 1
+    assert score_queue.job_status(db, 'job') == {'leased': 1, 'pending': 2}
+    assert score_queue.job_status(db, 'other') == {'done': 1}
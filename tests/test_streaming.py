@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from api_scoring import DIVISION_ORDER, ScoreTally, division_codes, subject_totals
+from ingestion import normalize_headers
+from streaming import stream_score
+
+SUBJECTS = ['subject1', 'subject2', 'subject3']
+
+
+def make_sheet(rows=257, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.integers(0, 101, size=(rows, 3)).astype(float), columns=['Subject1', 'Subject2', 'Subject3'])
+    df.insert(0, 'Name', [f's{i}' for i in range(rows)])
+    df.insert(1, 'Marks', rng.uniform(0, 100, size=rows).round(2))
+    df.loc[rng.random(rows) < 0.05, 'Marks'] = np.nan
+    return df
+
+
+def write_xlsx(df, path, blank_at=(10, 11, 100), trailing_blanks=3):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(list(df.columns))
+    for i, row in enumerate(df.itertuples(index=False)):
+        if i in blank_at:
+            ws.append([None] * len(df.columns))
+        ws.append([None if isinstance(v, float) and np.isnan(v) else v for v in row])
+    for _ in range(trailing_blanks):
+        ws.append([None] * len(df.columns))
+    wb.save(path)
+
+
+def in_memory_tally(df, subject_cols, max_marks=100):
+    df = normalize_headers(df.copy())
+    if subject_cols == ['marks']:
+        pct = df['marks'].to_numpy(dtype=float)
+    else:
+        pct = subject_totals(df, subject_cols, max_marks)[1]
+    return ScoreTally().update(pct), pct
+
+
+def assert_same(streamed, expected, pct):
+    assert streamed.to_dict() == pytest.approx(expected.to_dict())
+    counts = np.bincount(division_codes(pct), minlength=len(DIVISION_ORDER))
+    assert streamed.division_distribution() == dict(zip(DIVISION_ORDER, counts.tolist()))
+
+
+@pytest.mark.parametrize('subject_cols', [['marks'], SUBJECTS])
+def test_csv_matches_in_memory_score(tmp_path, subject_cols):
+    df = make_sheet()
+    path = tmp_path / 'class.csv'
+    df.to_csv(path, index=False)
+    expected, pct = in_memory_tally(pd.read_csv(path), subject_cols)
+    assert_same(stream_score(path, subject_cols, chunksize=16), expected, pct)
+
+
+@pytest.mark.parametrize('subject_cols', [['marks'], SUBJECTS])
+def test_xlsx_matches_in_memory_score(tmp_path, subject_cols):
+    path = tmp_path / 'class.xlsx'
+    write_xlsx(make_sheet(), path)
+    # pandas keeps blank rows between records and drops trailing ones
+    sheet = pd.read_excel(path)
+    assert sheet['Name'].isna().sum() == 3
+    expected, pct = in_memory_tally(sheet, subject_cols)
+    streamed = stream_score(path, subject_cols, chunksize=16)
+    assert streamed.total_students == len(sheet)
+    assert_same(streamed, expected, pct)
+
+
+def test_chunk_size_does_not_change_the_result(tmp_path):
+    path = tmp_path / 'class.xlsx'
+    write_xlsx(make_sheet(), path)
+    results = [stream_score(path, SUBJECTS, chunksize=size).to_dict() for size in (1, 7, 256, 10_000)]
+    assert all(result == pytest.approx(results[0]) for result in results)
+
+
+def test_missing_column_and_out_of_range_marks(tmp_path):
+    df = make_sheet(rows=5)
+    path = tmp_path / 'class.csv'
+    df.to_csv(path, index=False)
+    with pytest.raises(ValueError, match='missing columns'):
+        stream_score(path, ['subject9'])
+    df.loc[2, 'Marks'] = 101
+    df.to_csv(path, index=False)
+    with pytest.raises(ValueError, match='between 0 and 100'):
+        stream_score(path, ['marks'])